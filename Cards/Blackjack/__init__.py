@@ -2,3 +2,8 @@
 Would anyone like a game of blackjack?
 """
 from Cards.Blackjack.blackjack import *
+from Cards.Blackjack.engine import *
+from Cards.Blackjack.montecarlo import *
+from Cards.Blackjack.probability import *
+from Cards.Blackjack.counting import *
+from Cards.Blackjack.multiseat import *
@@ -1,7 +1,9 @@
 """
 This module simulates Blackjack
 """
-import random
+import copy
+from collections import namedtuple
+
 import Cards
 
 
@@ -11,6 +13,8 @@ class Card(Cards.Card):
 
     Child of Cards.Card, adds method value for blackjack hand evaluation.
     """
+    __slots__ = ()
+
     def value(self):
         """
         The value of a card in a blackjack deal.
@@ -30,7 +34,35 @@ class Hand(Cards.Hand):
     A hand of cards in blackjack.
 
     Child of Cards.Hand, adds method value for blackjack hand evaluation.
+    The hard total and number of aces are kept up to date as cards are added, so evaluating the hand is O(1).
+    Add cards with append rather than changing hand.cards directly.
     """
+    card_type = Card
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._hard, self._aces = 0, 0
+        for card in self.cards:
+            self._count(card)
+
+    def _count(self, card):
+        value = card.value()
+        if value == 11:
+            self._aces += 1
+            self._hard += 1
+        else:
+            self._hard += value
+
+    def append(self, item):
+        super().append(item)
+        self._count(item)
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self._hard, self._aces = 0, 0
+        for card in self.cards:
+            self._count(card)
+
     def sorted(self, **kwargs):
         raise NotImplementedError("It is important to preserve the deal order in Blackjack.")
 
@@ -39,12 +71,26 @@ class Hand(Cards.Hand):
         evaluate a blackjack hand
         :return: int; current value of hand
         """
-        val = sum([card.value() for card in self])
+        # if the hand has an ace, count one as 11 if it doesn't bust the hand
+        if self._aces and self._hard <= 11:
+            return self._hard + 10
+        return self._hard
+
+    def soft(self):
+        """
+        Figure out if the hand is soft, i.e. has an ace counted as 11.
+
+        :return: bool; whether the hand is soft
+        """
+        return bool(self._aces) and self._hard <= 11
 
-        # if hand is soft, alter to be below 21 if possible
-        aces = len(self.pip('ace'))
-        val -= 10*min(aces, 1 + max(val - 22, 0)//10)
-        return val
+    def bust(self):
+        """
+        Figure out if the hand is bust.
+
+        :return: bool; whether the hand is bust
+        """
+        return self._hard > 21
 
     def blackjack(self):
         """
@@ -52,23 +98,25 @@ class Hand(Cards.Hand):
 
         :return: bool; whether the hand is blackjack
         """
-        return True if (len(self) == 2) and (self.value() == 21) else False
+        return len(self.cards) == 2 and self.value() == 21
 
 
 class Shoe(Cards.Deck):
     """
     The same as a deck, it just requires blackjack cards
     """
-    def __init__(self, cards:list = None, decks:int = 1, shuffled:bool = True, suit_format="unicode"):
-        if cards is None:
-            self.cards = [
-                Card(pip, suit, display_suit=suit_format) for pip in range(2, 14) for suit in ('S', 'H', 'D', 'C')
-            ] * decks
-        else:
-            self.cards = cards * decks
+    card_type = Card
+    pips = range(2, 14)
 
-        if shuffled:
-            random.shuffle(self.cards)
+
+def _restore_hand(snapshot):
+    hand = Hand()
+    hand.restore(snapshot)
+    return hand
+
+
+TableState = namedtuple("TableState", ["shoe", "discards", "player", "dealer", "hands", "chips", "bet", "trackers",
+                                       "face_down"], defaults=((),))
 
 
 class Dealer:
@@ -99,6 +147,8 @@ class Dealer:
         """
         resolve the dealers betting round
         """
+        if len(self.hand) > 1:
+            table.reveal(self.hand[1])
         while self.value() < 17:
             self.hit_me(table)
 
@@ -107,7 +157,8 @@ class Dealer:
         reset the state of the dealer to have no cards
         """
         if discards is not None:
-            discards += self.hand
+            for card in self.hand:
+                discards.append(card)
         self.hand = Hand()
 
 
@@ -115,16 +166,50 @@ class Table:
     """
     A blackjack table with a single player and a dealer.
 
+    Use play_round to play without a human at the table, or play for an interactive game.
+
     :param decks: int; the number of decks
     :param chips: int; the number of chips the player has for betting
+    :param rng: random.Random; the random number generator used to shuffle the shoe - if None, uses the random module
+    :param penetration: float; the fraction of the shoe dealt before it is reshuffled, i.e. where the cut card goes
+    :param csm: bool; whether the shoe is a continuous shuffling machine, taking every hand's cards straight back
+
+    The shoe keeps its cards in one buffer for its whole life: a reshuffle puts the dealt cards back and shuffles
+    them in place, and a continuous shuffling machine swaps each hand's cards back into random places, costing no
+    more than the cards dealt. cut is the number of cards dealt before the next reshuffle, set from penetration
+    whenever the shoe is shuffled.
+
+    Set recorder to a history.HistoryRecorder to log every round played with play_round, and metrics to a
+    metrics.TableMetrics to time its phases.
+
+    For what-if analysis, snapshot a table and restore it to try each choice from the same point, or fork it to get
+    an independent copy. Neither copies the shoe until one of the tables reshuffles.
+
+    Trackers only see what a player at the table would: the burn card and the dealer's hole card are dealt face
+    down, listed in face_down, and shown to the trackers when they are turned over. The hole card is turned over
+    when the dealer resolves and the burn card at the end of the hand.
     """
-    def __init__(self, decks: int = 6, chips: int = 100, suit_format="unicode"):
+    def __init__(self, decks: int = 6, chips: int = 100, suit_format="unicode", rng=None, penetration: float = 0.25,
+                 csm: bool = False):
+        if not 0 < penetration < 1:
+            raise ValueError("penetration must be between 0 and 1")
+        if penetration >= getattr(rng, 'depth', 1):
+            raise ValueError(f"penetration must be below the depth the shoe is shuffled to, {rng.depth}")
         self.dealer = Dealer()
-        self.shoe = Shoe(decks=decks, shuffled=True)
-        self.discards = Shoe(cards=[])
+        self.shoe = Shoe(decks=decks, shuffled=True, suit_format=suit_format, rng=rng)
+        self.discards = Shoe(cards=[], rng=rng)
+        self.penetration = penetration
+        self.cut = int(penetration * len(self.shoe))
+        self.csm = csm
         self.player = Hand()
+        self.hands = []
         self.chips = chips
         self.bet = 0
+        self.recorder = None
+        self.metrics = None
+        # The choices made on each hand this round, by id(hand), only kept while recording
+        self.actions = {}
+        self.face_down = []
 
     def deal(self, hand):
         """
@@ -136,39 +221,180 @@ class Table:
         """
         Initial deal.
         """
-        # First, burn a card
-        self.shoe.deal(cards=0, burn=True, discards=self.discards)
-        # Deal to the player first, then the dealer
-        self.shoe.deal(self.player, self.dealer.hand, cards=2, discards=self.discards)
+        self._deal_round([self.player])
+
+    def _deal_round(self, hands):
+        """
+        Burn a card, then deal two cards to each hand in order and the dealer last, see face_down.
+        """
+        shoe = self.shoe
+        trackers, shoe.trackers = shoe.trackers, []
+        try:
+            shoe.deal(cards=0, burn=True, discards=self.discards)
+            shoe.deal(*hands, self.dealer.hand, cards=2)
+        finally:
+            shoe.trackers = trackers
+        if trackers:
+            self.face_down += [self.discards[-1], self.dealer.hand[1]]
+            for tracker in trackers:
+                for hand in hands:
+                    for card in hand:
+                        tracker.seen(card)
+                tracker.seen(self.dealer.hand[0])
+
+    def reveal(self, card=None):
+        """
+        Turn over a face down card, or all of them, and show it to the trackers.
+
+        :param card: Card; the card - if None, every face down card
+        """
+        if not self.face_down:
+            return
+        if card is None:
+            cards, self.face_down = self.face_down, []
+        elif card in self.face_down:
+            self.face_down.remove(card)
+            cards = [card]
+        else:
+            return
+        for tracker in self.shoe.trackers:
+            for card in cards:
+                tracker.seen(card)
+
+    def play_hand(self, hand, bet):
+        """
+        Play out one of the player's hands.
+
+        This is a generator: whenever the player has a decision to make it yields (hand, options) and expects the
+        chosen option to be sent back. It returns the list of (hand, bet) pairs the player ends up with, which
+        has more than one entry if the hand was split.
+
+        :param hand: Hand; the hand being played
+        :param bet: int; the bet riding on the hand
+        """
+        if not self.dealer.hand.blackjack():
+            while hand.value() <= 21:
+                options = generate_options(hand, bet, self.chips)
+                choice = yield hand, options
+                if choice not in options:
+                    raise ValueError(f'"{choice}" is not one of the options {", ".join(options)}')
+                if self.recorder is not None:
+                    self.actions.setdefault(id(hand), []).append(choice)
+                if choice == 'stand':
+                    break
+                elif choice == 'split':
+                    self.chips -= bet
+                    hands = []
+                    for card in hand:
+                        split = Hand(card)
+                        self.shoe.deal(split)
+                        if self.recorder is not None:
+                            self.actions[id(split)] = list(self.actions[id(hand)])
+                        hands += yield from self.play_hand(split, bet)
+                    return hands
+                elif choice == 'double':
+                    # A double gets exactly one more card
+                    self.chips -= bet
+                    bet *= 2
+                    self.shoe.deal(hand)
+                    break
+                else:
+                    self.shoe.deal(hand)
+        return [(hand, bet)]
+
+    def decide(self, choose):
+        """
+        Play the player's hand to the end, asking choose(hand, options) for every decision.
+
+        :return: list; the (hand, bet) pairs in play
+        """
+        game = self.play_hand(self.player, self.bet)
+        try:
+            hand, options = next(game)
+            while True:
+                hand, options = game.send(choose(hand, options))
+        except StopIteration as stop:
+            self.hands = stop.value
+        return self.hands
+
+    def settle(self, hands):
+        """
+        Pay out the player's hands against the dealer's.
+
+        :param hands: list; the (hand, bet) pairs in play
+        :return: list; an (outcome, payout) pair for each hand
+        """
+        results = []
+        dealer = self.dealer.value()
+        for hand, bet in hands:
+            if hand.blackjack():
+                result = ('blackjack', int(bet * 2.5))
+            elif hand.bust():
+                result = ('bust', 0)
+            elif dealer > 21:
+                result = ('dealer bust', 2*bet)
+            elif dealer < hand.value():
+                result = ('win', 2*bet)
+            else:
+                result = ('lose', 0)
+            self.chips += result[1]
+            results.append(result)
+        return results
+
+    def play_round(self, strategy, bet: int = 1) -> int:
+        """
+        Play a round without any input or output.
+
+        :param strategy: callable; strategy(hand, upcard, options) returns one of options
+        :param bet: int; the player's bet
+        :return: int; the player's net winnings for the round
+        """
+        if bet > self.chips:
+            raise ValueError("You do not have enough chips.")
+        self.chips -= bet
+        self.bet = bet
+        position = len(self.discards)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.start()
+
+        self.initial_deal()
+        if metrics is not None:
+            metrics.lap('deal')
+        upcard = self.dealer.hand[0]
+        hands = self.decide(lambda hand, options: strategy(hand, upcard, options))
+        if metrics is not None:
+            metrics.lap('decision')
+        self.dealer.resolve(self)
+        if metrics is not None:
+            metrics.lap('dealer')
+
+        results = self.settle(hands)
+        if metrics is not None:
+            metrics.lap('settle')
+        if self.recorder is not None:
+            self.recorder.record(self, position, hands, results)
+        net = sum([payout - hand_bet for (hand, hand_bet), (outcome, payout) in zip(hands, results)])
+        self.end_hand()
+        if metrics is not None:
+            metrics.round(len(hands))
+        return net
 
     def round(self):
         """
         Playing a round
         """
-        def make_choice(cards, dealer, bet, stack):
-            options = generate_options(cards, bet, stack)
-            print(f"Dealer shows: {dealer.print_hidden()}")
+        def make_choice(cards, options):
+            print(f"Dealer shows: {self.dealer.print_hidden()}")
             print(f"You're dealt: {', '.join([str(card) for card in cards])}")
-            print(f"Current bet: {bet}, Current stack: {stack}")
+            print(f"Current bet: {self.bet}, Current stack: {self.chips}")
             print(f"Your options: {', '.join([option for option in options])}\n")
             player_choice = input("Choose option: ").lower()
             if player_choice in options:
                 return player_choice
             else:
                 print("Your option was invalid, please try again.\n")
-                return make_choice(cards, dealer, bet, stack)
-
-        def action(player_choice, shoe, cards, bet):
-            """
-            refer to generate_options for list of possible options
-
-            current supported options are hit and double
-            (stand causes loop to break before this function is called and split is dealt with separately)
-            """
-            if player_choice == 'hit':
-                shoe.deal(cards)
-            elif player_choice == 'double':
-                shoe.deal(cards)
+                return make_choice(cards, options)
 
         print(f"You have {self.chips} chip{'s'*(self.chips > 1)}.")
         self.bet = input("How much would you like to bet?: ")
@@ -194,53 +420,26 @@ class Table:
 
         self.chips -= self.bet
 
-        def play_hand(dealer, shoe, hand, bet, stack, hands):
-            if not dealer.hand.blackjack():
-                while hand.value() <= 21:
-                    choice = make_choice(hand, dealer, bet, stack)
-                    if choice == 'split':
-                        self.chips -= self.bet
-                        h1 = Hand(hand[0])
-                        shoe.deal(h1)
-                        play_hand(dealer, shoe, h1, bet, stack, hands)
-                        h2 = Hand(hand[1])
-                        shoe.deal(h2)
-                        play_hand(dealer, shoe, h2, bet, stack, hands)
-                        return hands
-                    elif choice == 'double':
-                        self.chips -= self.bet
-                        self.bet *= 2
-                    action(choice, shoe, hand, bet)
-                    if choice == "stand":
-                        break
-            hands.append(hand)
-            return hands
-
-        all_hands = play_hand(self.dealer, self.shoe, self.player, self.bet, self.chips, [])
+        all_hands = self.decide(make_choice)
 
         self.dealer.resolve(self)
 
         # Print results
         print(f"Dealer shows: {self.dealer.print_reveal()}")
-        for hand in all_hands:
+        for (hand, bet), (outcome, payout) in zip(all_hands, self.settle(all_hands)):
             print(f"Player shows: {', '.join([str(card) for card in hand])}")
             if self.dealer.hand.blackjack():
                 print(f"Dealer has blackjack. House wins.")
-            if hand.blackjack():
-                print(f"Player has blackjack and wins {int(self.bet * 1.5)} chip{'s'*(self.chips > 1)}.")
-                self.chips += int(self.bet * 2.5)
-            elif hand.value() > 21:
+            if outcome == 'blackjack':
+                print(f"Player has blackjack and wins {payout - bet} chip{'s'*(self.chips > 1)}.")
+            elif outcome == 'bust':
                 print("Player busts.")
-            elif self.dealer.value() > 21:
-                print(f"Dealer busts. Player wins {int(self.bet)} chip{'s'*(self.chips > 1)}.")
-                self.chips += 2*self.bet
-            elif self.dealer.value() < hand.value():
-                print(f"Player wins {int(self.bet)} chip{'s'*(self.chips > 1)}.")
-                self.chips += 2*self.bet
-            elif self.dealer.value() >= hand.value():
-                print("House wins.")
+            elif outcome == 'dealer bust':
+                print(f"Dealer busts. Player wins {bet} chip{'s'*(self.chips > 1)}.")
+            elif outcome == 'win':
+                print(f"Player wins {bet} chip{'s'*(self.chips > 1)}.")
             else:
-                print("Something strange has happened.")
+                print("House wins.")
 
         self.end_hand()
 
@@ -248,13 +447,108 @@ class Table:
         """
         Clean up cards at the end of a hand.
         """
-        self.discards += self.dealer.hand + self.player
+        self.reveal()
+        for hand in [hand for hand, bet in self.hands] or [self.player]:
+            for card in hand:
+                self.discards.append(card)
         self.dealer.reset(self.discards)
         self.player = Hand()
+        self.hands = []
         self.bet = 0
-        if 3*len(self.discards) > len(self.shoe):
-            self.shoe = self.shoe + self.discards
-            self.shoe.shuffle()
+        self.actions.clear()
+        if self.csm:
+            if self.metrics is not None:
+                self.metrics.shoe(len(self.discards))
+                self.metrics.start()
+            self.shoe.reinsert(self.discards)
+            if self.shoe.trackers:
+                cards = self.discards[:]
+                for tracker in self.shoe.trackers:
+                    returned = getattr(tracker, 'returned', None)
+                    if returned is None:
+                        tracker.reset(self.shoe)
+                    else:
+                        for card in cards:
+                            returned(card)
+            del self.discards[:]
+            if self.metrics is not None:
+                self.metrics.lap('reshuffle')
+        elif len(self.discards) > self.cut:
+            if self.metrics is not None:
+                self.metrics.shoe(len(self.discards))
+                self.metrics.start()
+            self.shoe.reshuffle(self.discards)
+            del self.discards[:]
+            for tracker in self.shoe.trackers:
+                tracker.reset(self.shoe)
+            self.cut = int(self.penetration * len(self.shoe))
+            if self.metrics is not None:
+                self.metrics.lap('reshuffle')
+
+    def snapshot(self) -> TableState:
+        """
+        Capture the state of the table between decisions, to go back to with restore.
+
+        :return: TableState; the shoe and discards (see Cards.Deck.snapshot), everyone's cards, chips and bet
+        """
+        return TableState(
+            self.shoe.snapshot(), self.discards.snapshot(), self.player.snapshot(), self.dealer.hand.snapshot(),
+            tuple([(hand.snapshot(), bet) for hand, bet in self.hands]), self.chips, self.bet,
+            copy.deepcopy(self.shoe.trackers) if self.shoe.trackers else (), tuple(self.face_down),
+        )
+
+    def restore(self, state: TableState):
+        """
+        Put the table back to a snapshot.
+
+        The hands are new objects, so hands from before the restore are left alone. Trackers are replaced by copies
+        of the ones snapshotted. To carry on from a decision, play table.player with play_hand or decide.
+        """
+        self.shoe.restore(state.shoe)
+        self.discards.restore(state.discards)
+        self.player = _restore_hand(state.player)
+        self.dealer.hand = _restore_hand(state.dealer)
+        self.hands = [(_restore_hand(hand), bet) for hand, bet in state.hands]
+        self.chips, self.bet = state.chips, state.bet
+        self.face_down = list(state.face_down)
+        if state.trackers:
+            self.shoe.trackers = copy.deepcopy(state.trackers)
+        self.actions.clear()
+
+    def fork(self, rng=None):
+        """
+        An independent copy of the table, with its own shoe, random number generator, trackers and hands.
+
+        Copying the random number generator is most of the cost of a fork, pass a fresh one as rng to skip it.
+        The copy doesn't record history or metrics.
+
+        :param rng: random.Random; the copy's random number generator - if None, a copy of this table's
+        :return: Table; the copy
+        """
+        fork = copy.copy(self)
+        fork.shoe = self.shoe.fork(rng)
+        fork.discards = self.discards.fork(fork.shoe.rng)
+        fork.dealer = Dealer()
+        fork.dealer.hand = _restore_hand(self.dealer.hand.snapshot())
+        fork.player = _restore_hand(self.player.snapshot())
+        fork.hands = [(_restore_hand(hand.snapshot()), bet) for hand, bet in self.hands]
+        fork.recorder = None
+        fork.metrics = None
+        fork.actions = {}
+        fork.face_down = list(self.face_down)
+        return fork
+
+    def track(self, tracker):
+        """
+        Have a tracker (e.g. a counting.CountSystem) follow every card dealt from the shoe.
+
+        The tracker is reset whenever the shoe is reshuffled. With a continuous shuffling machine the cards from
+        every hand are passed to tracker.returned(card) as they go back into the shoe, or if the tracker has no
+        returned method it is reset, which may mean counting the whole shoe again every hand.
+        """
+        tracker.reset(self.shoe)
+        self.shoe.trackers.append(tracker)
+        return tracker
 
     def play(self):
         starting_chips = self.chips
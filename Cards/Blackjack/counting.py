@@ -0,0 +1,110 @@
+"""
+Card counting.
+
+Trackers follow the cards as they are dealt from a shoe, see Table.track. A card counts once a player at the
+table could see it: the burn card and the dealer's hole card only when they are turned over, the hole card when
+the dealer resolves and the burn card at the end of the hand (see Table.face_down). A continuous shuffling machine
+gives every hand's cards back through returned, which undoes seen.
+"""
+from Cards.Blackjack.probability import composition
+
+
+class Composition:
+    """
+    The cards left in a shoe, counted by blackjack value (see probability.composition).
+
+    :param shoe: Shoe; the shoe to start from - if None, start empty and wait for reset
+    """
+    def __init__(self, shoe=None):
+        self.counts = [0] * 10
+        if shoe is not None:
+            self.reset(shoe)
+
+    def __repr__(self):
+        return f"Composition{tuple(self.counts)}"
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def reset(self, shoe):
+        self.counts = list(composition(shoe))
+
+    def seen(self, card):
+        value = card.value()
+        self.counts[0 if value == 11 else value - 1] -= 1
+
+    def returned(self, card):
+        value = card.value()
+        self.counts[0 if value == 11 else value - 1] += 1
+
+    def composition(self) -> tuple:
+        """
+        The composition, ready for the probability functions.
+        """
+        return tuple(self.counts)
+
+
+class CountSystem:
+    """
+    A card counting system.
+
+    Subclasses set tags, the amount added to the running count for each blackjack value (ace is 1). The running
+    count starts at initial_count(decks) after every shuffle.
+    """
+    tags = {}
+
+    def __init__(self):
+        # Tags by pip, so seen is a single lookup
+        self._tags = [self.tags.get(1 if pip == 14 else min(pip, 10), 0) for pip in range(15)]
+        self.running = 0
+        self.remaining = 0
+        self.deck_size = 52
+
+    def __repr__(self):
+        return f"{type(self).__name__}{{running={self.running}, true={self.true_count():.2f}}}"
+
+    def initial_count(self, decks):
+        return 0
+
+    def reset(self, shoe):
+        self.remaining = len(shoe)
+        self.deck_size = 4 * len(shoe.pips)
+        self.running = self.initial_count(self.remaining / self.deck_size)
+
+    def seen(self, card):
+        self.running += self._tags[card.pip]
+        self.remaining -= 1
+
+    def returned(self, card):
+        self.running -= self._tags[card.pip]
+        self.remaining += 1
+
+    def true_count(self) -> float:
+        """
+        The running count per deck left in the shoe.
+        """
+        return self.running * self.deck_size / self.remaining if self.remaining else 0.
+
+
+class HiLo(CountSystem):
+    """
+    The Hi-Lo count.
+    """
+    tags = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 10: -1, 1: -1}
+
+
+class KO(CountSystem):
+    """
+    The Knock-Out count, unbalanced so the running count is used as it is.
+    """
+    tags = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 1, 10: -1, 1: -1}
+
+    def initial_count(self, decks):
+        return round(4 - 4 * decks)
+
+
+class OmegaII(CountSystem):
+    """
+    The Omega II count.
+    """
+    tags = {2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 1, 9: -1, 10: -2}
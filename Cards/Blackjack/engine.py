@@ -0,0 +1,48 @@
+"""
+Play blackjack without a human at the table.
+
+A strategy is any callable strategy(hand, upcard, options) that returns one of the options given by
+generate_options, e.g. 'hit' or 'stand'.
+"""
+from Cards.Blackjack.blackjack import Table
+
+
+def dealer_strategy(hand, upcard, options):
+    """
+    Play like the dealer: hit on anything under 17.
+    """
+    return 'hit' if hand.value() < 17 else 'stand'
+
+
+def stand_strategy(hand, upcard, options):
+    """
+    Never take another card.
+    """
+    return 'stand'
+
+
+def simulate(strategy, rounds: int, decks: int = 6, bet: int = 1, table: Table = None, rng=None) -> list:
+    """
+    Play a number of rounds with a strategy.
+
+    The player never runs out of chips, so every round is played at the same bet.
+
+    :param strategy: callable; strategy(hand, upcard, options) returns one of options
+    :param rounds: int; the number of rounds to play
+    :param decks: int; the number of decks in the shoe, ignored if table is given
+    :param bet: int; the bet placed on every round
+    :param table: Table; a table to play at, a new one if None
+    :param rng: random.Random; the random number generator for a new table, ignored if table is given
+    :return: list; the player's net winnings for each round
+    """
+    if table is None:
+        table = Table(decks=decks, rng=rng)
+    # Enough to cover any number of splits and doubles
+    bankroll = 1 << 62
+    chips, table.chips = table.chips, bankroll
+
+    play_round = table.play_round
+    results = [play_round(strategy, bet) for _ in range(rounds)]
+
+    table.chips = chips + table.chips - bankroll
+    return results
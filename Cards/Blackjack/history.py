@@ -0,0 +1,168 @@
+"""
+Blackjack hand histories in a compact binary log.
+
+Every player hand settled at a recorded table is written as one fixed width record: the round number, how far
+into the shoe the round started, the seat and which of the seat's hands it is (more than one after a split), the
+hand's cards, the dealer's cards, the player's choices, the bet and the payout.
+Cards are stored as codes (see Cards.Card.code) and unused slots are 0. Records are appended through a buffered
+file, and read back with read_history, or read_array for a NumPy structured array over a memory map.
+"""
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from Cards.Blackjack.blackjack import Card, Hand
+
+MAGIC = b'BJHH'
+VERSION = 2
+HEADER = struct.Struct('<4sHH')
+
+SLOTS = 12
+RECORD = struct.Struct(f'<QIHBBii{SLOTS}s{SLOTS}s{SLOTS}s')
+
+ACTIONS = ('stand', 'hit', 'double', 'split')
+RESULTS = ('blackjack', 'bust', 'dealer bust', 'win', 'lose')
+
+HandRecord = namedtuple("HandRecord", ["round", "position", "seat", "hand", "outcome", "bet", "payout", "player",
+                                       "dealer", "actions"])
+
+
+def _pack(codes):
+    return bytes(codes[:SLOTS])
+
+
+class HistoryRecorder:
+    """
+    Appends hand records to a log file.
+
+    Use as a context manager, or call close, so the last buffered records get written. Recording to an existing
+    log carries on its round numbers.
+
+    :param path: str; the log file, created if it doesn't exist
+    :param buffer_size: int; the number of bytes buffered between writes
+    """
+    def __init__(self, path, buffer_size: int = 1 << 20):
+        self.path = path
+        self.rounds = _next_round(path)
+        self.file = open(path, 'ab', buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def record(self, table, position, hands, results, seats=None):
+        """
+        Write the records for a settled round.
+
+        :param table: Table; the table the round was played at
+        :param position: int; the number of cards dealt from the shoe before the round
+        :param hands: list; the (hand, bet) pairs that were settled
+        :param results: list; the (outcome, payout) pairs from Table.settle
+        :param seats: list; the seat each hand was played from - if None, they're all from seat 0
+        """
+        dealer = _pack([card.code for card in table.dealer.hand])
+        write = self.file.write
+        seats = [0] * len(hands) if seats is None else seats
+        played = {}
+        for seat, (hand, bet), (outcome, payout) in zip(seats, hands, results):
+            i = played[seat] = played.get(seat, -1) + 1
+            actions = _pack([ACTIONS.index(action) + 1 for action in table.actions.get(id(hand), [])])
+            write(RECORD.pack(self.rounds, position, seat, i, RESULTS.index(outcome), bet, payout,
+                              _pack([card.code for card in hand]), dealer, actions))
+        self.rounds += 1
+
+
+def _next_round(path) -> int:
+    """
+    The round number after the last one in a log, 0 for a new log. A record cut short by a crash is cut off so
+    the records appended after it line up.
+    """
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+    if size == 0:
+        return 0
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION, RECORD.size):
+            raise ValueError(f"{path} is not a version {VERSION} blackjack hand history")
+        n = (size - HEADER.size) // RECORD.size
+        if not n:
+            last = None
+        else:
+            f.seek(HEADER.size + (n - 1) * RECORD.size)
+            last = RECORD.unpack(f.read(RECORD.size))[0]
+    if size != HEADER.size + n * RECORD.size:
+        os.truncate(path, HEADER.size + n * RECORD.size)
+    return 0 if last is None else last + 1
+
+
+def _records(path):
+    """
+    Memory-map a log and return the map and the number of whole records in it.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= HEADER.size:
+            return None, 0
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, size = HEADER.unpack_from(data)
+    if (magic, version, size) != (MAGIC, VERSION, RECORD.size):
+        data.close()
+        raise ValueError(f"{path} is not a version {VERSION} blackjack hand history")
+    # A record cut short by a crash is left out
+    return data, (len(data) - HEADER.size) // RECORD.size
+
+
+def read_history(path, decode: bool = True):
+    """
+    Stream the records in a log.
+
+    :param path: str; the log file
+    :param decode: bool; turn codes back into Hands and names - if False, yield the raw fields
+    :return: generator; HandRecords
+    """
+    data, n = _records(path)
+    if data is None:
+        return
+    try:
+        for offset in range(HEADER.size, HEADER.size + n * RECORD.size, RECORD.size):
+            record = HandRecord(*RECORD.unpack_from(data, offset))
+            if decode:
+                record = record._replace(
+                    outcome=RESULTS[record.outcome],
+                    player=Hand(*[Card.from_code(code) for code in record.player if code]),
+                    dealer=Hand(*[Card.from_code(code) for code in record.dealer if code]),
+                    actions=[ACTIONS[action - 1] for action in record.actions if action],
+                )
+            yield record
+    finally:
+        data.close()
+
+
+def read_array(path):
+    """
+    Read a log as a NumPy structured array, memory-mapped rather than loaded.
+
+    :param path: str; the log file
+    :return: np.memmap; one row per record with the fields of HandRecord
+    """
+    import numpy as np
+
+    dtype = np.dtype([('round', '<u8'), ('position', '<u4'), ('seat', '<u2'), ('hand', 'u1'), ('outcome', 'u1'),
+                      ('bet', '<i4'), ('payout', '<i4'), ('player', 'u1', SLOTS), ('dealer', 'u1', SLOTS),
+                      ('actions', 'u1', SLOTS)])
+    data, n = _records(path)
+    if data is not None:
+        data.close()
+    if not n:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER.size, shape=(n,))
@@ -0,0 +1,178 @@
+"""
+Counters and timing histograms for blackjack tables.
+
+Set table.metrics to a TableMetrics and every round played with play_round is timed phase by phase: the initial
+deal, the player's decisions, the dealer resolving, settling, and reshuffling at the end of a hand. It also counts
+rounds, hands and reshuffles, and how many cards each shoe dealt before it was reshuffled. With a continuous
+shuffling machine every hand's cards going back into the shoe counts as a reshuffle of the cards dealt that hand.
+Tables without metrics only pay for a few "is not None" checks per round.
+
+A snapshot of everything can be exported as JSON or in the Prometheus text format, and written to a file every so
+many seconds for long runs.
+"""
+import json
+import os
+import time
+from bisect import bisect_left
+
+PHASES = ('deal', 'decision', 'dealer', 'settle', 'reshuffle')
+
+# Histogram bucket upper bounds: 1us to about 1s for phases, 16 to 4096 cards for shoes
+SECONDS = tuple([1e-6 * 2 ** k for k in range(21)])
+CARDS = tuple([2 ** k for k in range(4, 13)])
+
+
+class Histogram:
+    """
+    Counts of observations falling at or under each of a set of upper bounds, as in Prometheus.
+
+    :param bounds: tuple; the increasing bucket upper bounds, an overflow bucket is added
+    """
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.
+
+    def __repr__(self):
+        return f"Histogram{{{self.count} observations, mean {self.mean():.3g}}}"
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.
+
+    def cumulative(self) -> list:
+        """
+        :return: list; (upper bound, observations at or under it) pairs, ending with float('inf')
+        """
+        total, pairs = 0, []
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def snapshot(self) -> dict:
+        return {'count': self.count, 'sum': self.sum, 'buckets': [[bound, count] for bound, count
+                                                                  in self.cumulative()[:-1]]}
+
+
+class TableMetrics:
+    """
+    Instrumentation for a Table, see the module docstring.
+
+    :param path: str; a file to write snapshots to - if None, nothing is written
+    :param every: float; the seconds between writes to path, checked at the end of every round
+    :param format: str; 'json' or 'prometheus'
+    :param prefix: str; the prefix of the Prometheus metric names
+    """
+    def __init__(self, path: str = None, every: float = 10., format: str = 'json', prefix: str = 'cards_blackjack'):
+        if format not in ('json', 'prometheus'):
+            raise ValueError(f'"{format}" is not a snapshot format, use json or prometheus')
+        self.path, self.every, self.format, self.prefix = path, every, format, prefix
+        self.phases = {phase: Histogram(SECONDS) for phase in PHASES}
+        self.cards_per_shoe = Histogram(CARDS)
+        self.rounds = 0
+        self.hands = 0
+        self.reshuffles = 0
+        self.started = time.time()
+        self._last = 0.
+        self._written = time.perf_counter()
+
+    def __repr__(self):
+        return f"TableMetrics{{{self.rounds} rounds, {self.reshuffles} reshuffles}}"
+
+    def start(self):
+        """
+        Start timing the first phase.
+        """
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Finish timing a phase and start timing the next.
+        """
+        now = time.perf_counter()
+        self.phases[phase].observe(now - self._last)
+        self._last = now
+
+    def shoe(self, cards: int):
+        """
+        Count a reshuffle of a shoe that dealt a number of cards.
+        """
+        self.reshuffles += 1
+        self.cards_per_shoe.observe(cards)
+
+    def round(self, hands: int):
+        """
+        Count a finished round with a number of player hands, and write a snapshot if one is due.
+        """
+        self.rounds += 1
+        self.hands += hands
+        if self.path is not None and time.perf_counter() - self._written >= self.every:
+            self.write()
+
+    def snapshot(self) -> dict:
+        """
+        :return: dict; every counter and histogram, with seconds for timings
+        """
+        return {
+            'time': time.time(),
+            'uptime': time.time() - self.started,
+            'rounds': self.rounds,
+            'hands': self.hands,
+            'reshuffles': self.reshuffles,
+            'reshuffles_per_round': self.reshuffles / self.rounds if self.rounds else 0.,
+            'phases': {phase: histogram.snapshot() for phase, histogram in self.phases.items()},
+            'cards_per_shoe': self.cards_per_shoe.snapshot(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        :return: str; the metrics in the Prometheus text exposition format
+        """
+        p = self.prefix
+        lines = []
+        for name, value, text in (('rounds_total', self.rounds, 'Rounds played.'),
+                                  ('hands_total', self.hands, 'Player hands settled.'),
+                                  ('reshuffles_total', self.reshuffles, 'Shoes reshuffled.')):
+            lines += [f"# HELP {p}_{name} {text}", f"# TYPE {p}_{name} counter", f"{p}_{name} {value}"]
+
+        lines += [f"# HELP {p}_phase_seconds Time spent in each phase of a round.",
+                  f"# TYPE {p}_phase_seconds histogram"]
+        for phase, histogram in self.phases.items():
+            lines += _histogram_lines(f"{p}_phase_seconds", histogram, f'phase="{phase}",')
+
+        lines += [f"# HELP {p}_shoe_cards Cards dealt from a shoe before it was reshuffled.",
+                  f"# TYPE {p}_shoe_cards histogram"]
+        lines += _histogram_lines(f"{p}_shoe_cards", self.cards_per_shoe)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str = None):
+        """
+        Write a snapshot in the chosen format, replacing the file in one go so readers never see half of one.
+
+        :param path: str; the file - if None, self.path
+        """
+        path = self.path if path is None else path
+        temp = f'{path}.{os.getpid()}.tmp'
+        with open(temp, 'w') as f:
+            f.write(self.to_json() if self.format == 'json' else self.to_prometheus())
+        os.replace(temp, path)
+        self._written = time.perf_counter()
+
+
+def _histogram_lines(name, histogram, labels=''):
+    lines = []
+    for bound, count in histogram.cumulative():
+        le = '+Inf' if bound == float('inf') else f'{bound:g}'
+        lines.append(f'{name}_bucket{{{labels}le="{le}"}} {count}')
+    labels = f"{{{labels.rstrip(',')}}}" if labels else ''
+    lines += [f"{name}_sum{labels} {histogram.sum}", f"{name}_count{labels} {histogram.count}"]
+    return lines
@@ -0,0 +1,110 @@
+"""
+Monte Carlo blackjack simulations spread across processes.
+
+The rounds are split into fixed size chunks and every chunk gets its own random.Random seeded from a master seed,
+so the results for a given seed are the same however many workers play them.
+"""
+import random
+from collections import Counter
+
+from Cards.Blackjack.engine import simulate
+
+
+class Summary:
+    """
+    A streaming summary of the net chips won per round.
+
+    Keeps the count, mean and variance (Welford's algorithm) and a histogram of results, so results can be added
+    one round at a time and summaries from different workers merged.
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.histogram = Counter()
+
+    def __repr__(self):
+        return f"Summary{{n={self.n}, mean={self.mean:.6f}, std={self.std:.6f}}}"
+
+    def add(self, result):
+        self.n += 1
+        delta = result - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (result - self.mean)
+        self.histogram[result] += 1
+
+    def update(self, results):
+        for result in results:
+            self.add(result)
+        return self
+
+    def merge(self, other):
+        """
+        Combine another summary into this one.
+        """
+        n = self.n + other.n
+        if n:
+            delta = other.mean - self.mean
+            self._m2 += other._m2 + delta * delta * self.n * other.n / n
+            self.mean += delta * other.n / n
+        self.n = n
+        self.histogram.update(other.histogram)
+        return self
+
+    @property
+    def variance(self):
+        """
+        The sample variance of the results.
+        """
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    @property
+    def stderr(self):
+        """
+        The standard error of the mean.
+        """
+        return (self.variance / self.n) ** 0.5 if self.n else 0.0
+
+
+def _run_chunk(strategy, rounds, decks, bet, seed):
+    return Summary().update(simulate(strategy, rounds, decks=decks, bet=bet, rng=random.Random(seed)))
+
+
+def monte_carlo(strategy, rounds: int, decks: int = 6, bet: int = 1, seed: int = 0, workers: int = None,
+                chunk: int = 100000) -> Summary:
+    """
+    Play a number of rounds with a strategy across a pool of processes.
+
+    Each chunk of rounds is played at a fresh table, so the strategy has to be picklable (e.g. a module level
+    function).
+
+    :param strategy: callable; strategy(hand, upcard, options) returns one of options
+    :param rounds: int; the total number of rounds to play
+    :param decks: int; the number of decks in the shoe
+    :param bet: int; the bet placed on every round
+    :param seed: int; the master seed
+    :param workers: int; the number of processes - if None, one per CPU, if 1, play in this process
+    :param chunk: int; the number of rounds played at each table
+    :return: Summary; the net chips won per round
+    """
+    master = random.Random(seed)
+    sizes = [chunk] * (rounds // chunk) + ([rounds % chunk] if rounds % chunk else [])
+    seeds = [master.getrandbits(64) for _ in sizes]
+    args = ([strategy] * len(sizes), sizes, [decks] * len(sizes), [bet] * len(sizes), seeds)
+
+    summary = Summary()
+    if workers == 1:
+        summaries = map(_run_chunk, *args)
+    else:
+        # Imported here as it's slow to import and only needed for a pool
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            summaries = list(pool.map(_run_chunk, *args))
+    for chunk_summary in summaries:
+        summary.merge(chunk_summary)
+    return summary
@@ -0,0 +1,138 @@
+"""
+Blackjack tables with several seats sharing one shoe, and a loop to run many tables together.
+"""
+import copy
+import time
+
+from Cards.Blackjack.blackjack import Hand, Table
+
+
+class Seat:
+    """
+    A player sitting at a MultiTable.
+
+    :param strategy: callable; strategy(hand, upcard, options) returns one of options
+    :param chips: int; the number of chips the player has for betting
+    :param bet: int; the bet the player places every round
+    """
+    def __init__(self, strategy, chips: int = 100, bet: int = 1):
+        self.strategy = strategy
+        self.chips = chips
+        self.bet = bet
+        self.hand = Hand()
+        self.hands = []
+        self.hands_played = 0
+
+    def __repr__(self):
+        return f"Seat{{{self.chips} chips, {self.hands_played} hands}}"
+
+
+class MultiTable(Table):
+    """
+    A blackjack table with several seats and a dealer.
+
+    Each round every seat that can cover its bet is dealt in, all in one pass of the shoe, then plays its hand with
+    its own strategy before the dealer resolves.
+
+    :param seats: list; the Seats at the table
+    :param decks: int; the number of decks
+    :param rng: random.Random; the random number generator used to shuffle the shoe - if None, uses the random module
+    :param penetration: float; the fraction of the shoe dealt before it is reshuffled
+    :param csm: bool; whether the shoe is a continuous shuffling machine, see Table
+    """
+    def __init__(self, seats, decks: int = 6, rng=None, penetration: float = 0.25, csm: bool = False):
+        super().__init__(decks=decks, chips=0, rng=rng, penetration=penetration, csm=csm)
+        self.seats = list(seats)
+
+    def play_round(self) -> int:
+        """
+        Play a round for every seat without any input or output.
+
+        :return: int; the number of hands settled, counting each hand of a split
+        """
+        seats = [seat for seat in self.seats if seat.chips >= seat.bet]
+        position = len(self.discards)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.start()
+        for seat in seats:
+            seat.chips -= seat.bet
+            seat.hand = Hand()
+
+        # First, burn a card, then deal the seats in order and the dealer last
+        self._deal_round([seat.hand for seat in seats])
+        upcard = self.dealer.hand[0]
+        if metrics is not None:
+            metrics.lap('deal')
+
+        # Table keeps a single player's state, so each seat takes its turn in it
+        for seat in seats:
+            self.chips, self.player, self.bet = seat.chips, seat.hand, seat.bet
+            seat.hands = self.decide(lambda hand, options: seat.strategy(hand, upcard, options))
+            seat.chips = self.chips
+        if metrics is not None:
+            metrics.lap('decision')
+
+        self.dealer.resolve(self)
+        if metrics is not None:
+            metrics.lap('dealer')
+
+        hands, results = [], []
+        for seat in seats:
+            self.chips = seat.chips
+            hands += seat.hands
+            results += self.settle(seat.hands)
+            seat.chips = self.chips
+            seat.hands_played += len(seat.hands)
+        if metrics is not None:
+            metrics.lap('settle')
+        if self.recorder is not None:
+            numbers = [i for i, seat in enumerate(self.seats) for _ in seat.hands]
+            self.recorder.record(self, position, hands, results, numbers)
+
+        self.end_hand()
+        if metrics is not None:
+            metrics.round(len(hands))
+        return len(hands)
+
+    def fork(self, rng=None):
+        fork = super().fork(rng)
+        fork.seats = [copy.copy(seat) for seat in self.seats]
+        return fork
+
+    def end_hand(self):
+        """
+        Clean up every seat's cards at the end of a hand.
+        """
+        for seat in self.seats:
+            for hand in [hand for hand, bet in seat.hands] or [seat.hand]:
+                for card in hand:
+                    self.discards.append(card)
+            seat.hand = Hand()
+            seat.hands = []
+        self.chips, self.player, self.hands = 0, Hand(), []
+        super().end_hand()
+
+
+def run_tables(tables, rounds: int) -> dict:
+    """
+    Play a number of rounds at each table, taking turns a round at a time.
+
+    :param tables: list; the MultiTables to play
+    :param rounds: int; the number of rounds to play at each table
+    :return: dict; hands and hands per second for each table under 'tables', and for all of them under 'overall'
+    """
+    seconds = [0.] * len(tables)
+    hands = [0] * len(tables)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i, table in enumerate(tables):
+            round_start = time.perf_counter()
+            hands[i] += table.play_round()
+            seconds[i] += time.perf_counter() - round_start
+    elapsed = time.perf_counter() - start
+
+    return {
+        'tables': [{'hands': n, 'hands_per_second': n / s if s else 0.} for n, s in zip(hands, seconds)],
+        'overall': {'hands': sum(hands), 'hands_per_second': sum(hands) / elapsed if elapsed else 0.},
+    }
@@ -0,0 +1,99 @@
+"""
+Exact blackjack probabilities for a given shoe composition.
+
+A composition is a tuple of 10 counts: the number of cards left of each blackjack value, from ace (index 0) up to
+ten (index 9, which includes the picture cards).
+
+The dealer's outcomes are cached by composition, for up to CACHE_SIZE compositions and totals (all ten upcards
+from one composition of a six deck shoe take about 10,000, a few hundred bytes each). Call clear_cache to free it.
+"""
+from functools import lru_cache
+
+OUTCOMES = (17, 18, 19, 20, 21, 'bust')
+CACHE_SIZE = 1 << 16
+
+
+def composition(cards) -> tuple:
+    """
+    Count the cards left in a shoe by blackjack value.
+
+    :param cards: Shoe or iterable of Card; the cards left
+    :return: tuple; the composition
+    """
+    counts = [0] * 10
+    for card in (cards[:] if hasattr(cards, 'deal') else cards):
+        counts[_value(card) - 1] += 1
+    return tuple(counts)
+
+
+def _value(card) -> int:
+    """
+    The blackjack value of a card, with aces as 1.
+    """
+    if isinstance(card, int):
+        return 1 if card == 11 else card
+    return 1 if card.value() == 11 else card.value()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _dealer(counts, hard, aces):
+    """
+    The distribution of the dealer's final total from a hand with a hard total and (any) aces.
+
+    Cached by composition, so repeated queries from the same point in a shoe are free.
+    """
+    total = hard + 10 if aces and hard <= 11 else hard
+    if total > 21:
+        return 0., 0., 0., 0., 0., 1.
+    if total >= 17:
+        return tuple([1. if total == outcome else 0. for outcome in OUTCOMES])
+
+    n = sum(counts)
+    distribution = [0.] * len(OUTCOMES)
+    for i, count in enumerate(counts):
+        if count:
+            drawn = counts[:i] + (count - 1,) + counts[i + 1:]
+            p = count / n
+            for j, q in enumerate(_dealer(drawn, hard + i + 1, aces or i == 0)):
+                distribution[j] += p * q
+    return tuple(distribution)
+
+
+def clear_cache():
+    """
+    Empty the cache of dealer outcomes.
+    """
+    _dealer.cache_clear()
+
+
+def dealer_probabilities(counts, upcard) -> dict:
+    """
+    The exact distribution of the dealer's final total, standing on all 17s as in Dealer.resolve.
+
+    If the shoe could run out before the dealer finishes, the probabilities add up to less than one.
+
+    :param counts: tuple; the composition of the shoe, not including the upcard
+    :param upcard: Card or int; the dealer's face up card, or its blackjack value
+    :return: dict; the probability of each of OUTCOMES
+    """
+    value = _value(upcard)
+    return dict(zip(OUTCOMES, _dealer(tuple(counts), value, value == 1)))
+
+
+def stand_ev(counts, upcard, total: int) -> float:
+    """
+    The expected net chips per chip bet from standing on a total.
+
+    Ties go to the house, as in Table.settle.
+
+    :param counts: tuple; the composition of the shoe, not including the upcard
+    :param upcard: Card or int; the dealer's face up card, or its blackjack value
+    :param total: int; the player's total
+    :return: float; the expected value of standing
+    """
+    if total > 21:
+        return -1.
+    probabilities = dealer_probabilities(counts, upcard)
+    win = probabilities['bust'] + sum([p for outcome, p in probabilities.items()
+                                       if outcome != 'bust' and outcome < total])
+    return 2 * win - 1
@@ -0,0 +1,235 @@
+"""
+An asyncio blackjack server.
+
+Every connection gets its own Table and plays over a line protocol. The client sends
+
+    BET <chips>         start a round
+    <option>            one of the options offered, e.g. HIT or STAND
+    QUIT                leave the table
+
+and the server answers with
+
+    WELCOME <chips>
+    HAND <cards> VALUE <value> DEALER <upcard>
+    OPTIONS <option,option,...>
+    DEALER <cards> VALUE <value>
+    RESULT <cards> <outcome> <payout>
+    CHIPS <chips>
+    ERROR <message>
+    BYE
+
+Cards are written in letter format, e.g. 10S or QH. Run python -m Cards.Blackjack.server to serve on a port.
+"""
+import asyncio
+import time
+from collections import deque
+
+from Cards.Blackjack.blackjack import Table
+
+
+def _cards(hand):
+    return " ".join([str(card) for card in hand])
+
+
+class Session:
+    """
+    A player's game on one connection.
+
+    :param server: BlackjackServer; the server the session belongs to
+    :param reader: asyncio.StreamReader; the connection's reader
+    :param writer: asyncio.StreamWriter; the connection's writer
+    """
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader, self.writer = reader, writer
+        self.table = Table(decks=server.decks, chips=server.chips, suit_format="letter")
+        self._received = None
+
+    async def send(self, *lines):
+        self.writer.write("".join([line + "\n" for line in lines]).encode())
+        await self.writer.drain()
+        if self._received is not None:
+            self.server.actions += 1
+            self.server.latencies.append(time.perf_counter() - self._received)
+            self._received = None
+
+    async def receive(self):
+        while True:
+            try:
+                line = await self.reader.readline()
+            except ValueError:
+                await self.send("ERROR line too long")
+                continue
+            if not line:
+                raise ConnectionResetError("the client went away")
+            try:
+                text = line.decode()
+            except UnicodeDecodeError:
+                await self.send("ERROR expected UTF-8 text")
+                continue
+            self._received = time.perf_counter()
+            return text.strip().lower()
+
+    async def run(self):
+        await self.send(f"WELCOME {self.table.chips}")
+        while True:
+            command = (await self.receive()).split()
+            if not command:
+                continue
+            if command[0] == "quit":
+                await self.send("BYE")
+                return
+            if (command[0] != "bet" or len(command) != 2 or not (command[1].isascii() and command[1].isdecimal())
+                    or int(command[1]) < 1):
+                await self.send("ERROR expected BET <chips>")
+            elif int(command[1]) > self.table.chips:
+                await self.send("ERROR You do not have enough chips.")
+            else:
+                await self.round(int(command[1]))
+
+    async def round(self, bet):
+        table = self.table
+        table.chips -= bet
+        table.bet = bet
+        table.initial_deal()
+        upcard = table.dealer.hand[0]
+
+        game = table.play_hand(table.player, bet)
+        try:
+            hand, options = next(game)
+            while True:
+                await self.send(f"HAND {_cards(hand)} VALUE {hand.value()} DEALER {upcard}",
+                                f"OPTIONS {','.join(options)}")
+                choice = await self.receive()
+                while choice not in options:
+                    await self.send(f"ERROR expected one of {','.join(options)}")
+                    choice = await self.receive()
+                hand, options = game.send(choice)
+        except StopIteration as stop:
+            table.hands = stop.value
+
+        table.dealer.resolve(table)
+        lines = [f"DEALER {_cards(table.dealer.hand)} VALUE {table.dealer.value()}"]
+        for (hand, hand_bet), (outcome, payout) in zip(table.hands, table.settle(table.hands)):
+            lines.append(f"RESULT {_cards(hand)} {outcome.replace(' ', '_')} {payout}")
+        lines.append(f"CHIPS {table.chips}")
+        table.end_hand()
+        await self.send(*lines)
+
+
+class BlackjackServer:
+    """
+    Serves blackjack sessions over TCP or a Unix socket, all in one event loop.
+
+    :param decks: int; the number of decks in each session's shoe
+    :param chips: int; the number of chips each session starts with
+    :param window: int; the number of most recent actions whose latencies are kept for percentile
+    """
+    def __init__(self, decks: int = 6, chips: int = 100, window: int = 100000):
+        self.decks = decks
+        self.chips = chips
+        self.sessions = 0
+        self.actions = 0
+        self.latencies = deque(maxlen=window)
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        try:
+            await Session(self, reader, writer).run()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8021):
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def start_unix(self, path: str):
+        return await asyncio.start_unix_server(self.handle, path)
+
+    def percentile(self, q: float = 99) -> float:
+        """
+        A percentile of the time from receiving a player's line to finishing the reply over the most recent
+        actions, in seconds.
+        """
+        if not self.latencies:
+            return 0.
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
+
+
+async def play_client(reader, writer, rounds: int, bet: int = 1, stand_on: int = 17):
+    """
+    A test client: bet and play a number of rounds, hitting under stand_on.
+
+    :return: int; the client's chips at the end
+    """
+    chips = int((await reader.readline()).split()[1])
+    for _ in range(rounds):
+        if chips < bet:
+            break
+        writer.write(f"BET {bet}\n".encode())
+        while True:
+            line = (await reader.readline()).decode().split()
+            if line[0] == "OPTIONS":
+                writer.write(b"hit\n" if value < stand_on and "hit" in line[1].split(",") else b"stand\n")
+            elif line[0] == "HAND":
+                value = int(line[line.index("VALUE") + 1])
+            elif line[0] == "CHIPS":
+                chips = int(line[1])
+                break
+            elif line[0] == "ERROR":
+                raise RuntimeError(" ".join(line))
+    writer.write(b"QUIT\n")
+    await reader.readline()
+    writer.close()
+    return chips
+
+
+async def load_test(sessions: int = 1000, rounds: int = 10, path: str = None) -> dict:
+    """
+    Start a server and play many concurrent test clients against it.
+
+    :param sessions: int; the number of concurrent sessions
+    :param rounds: int; the number of rounds each session plays
+    :param path: str; a Unix socket to serve on - if None, a free TCP port on localhost
+    :return: dict; the number of actions, actions per second and p50/p99 latency in seconds
+    """
+    server = BlackjackServer()
+    if path is None:
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        connect = lambda: asyncio.open_connection("127.0.0.1", port)
+    else:
+        listener = await server.start_unix(path)
+        connect = lambda: asyncio.open_unix_connection(path)
+
+    # Open connections a batch at a time so the listen queue doesn't overflow, the sessions still all run together
+    connecting = asyncio.Semaphore(64)
+
+    async def client():
+        async with connecting:
+            reader, writer = await connect()
+        return await play_client(reader, writer, rounds)
+
+    start = time.perf_counter()
+    async with listener:
+        await asyncio.gather(*[client() for _ in range(sessions)])
+    elapsed = time.perf_counter() - start
+    return {
+        'actions': server.actions,
+        'actions_per_second': server.actions / elapsed,
+        'p50': server.percentile(50),
+        'p99': server.percentile(99),
+    }
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8021):
+    server = await BlackjackServer().start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
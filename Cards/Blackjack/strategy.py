@@ -0,0 +1,190 @@
+"""
+Basic strategy for blackjack from precomputed expected values.
+
+For every player total, soft flag, pair flag and dealer upcard the expected net chips per chip bet of standing,
+hitting, doubling and splitting are solved once per number of decks and cached in a small binary file. Later runs
+memory-map the file, so looking up the best action is a single index.
+
+The solve is total-dependent: the dealer's outcomes are exact for a full shoe less the upcard (see probability) and
+the player's draws come from that same composition. Ties go to the house and a two card 21 after a split pays as
+blackjack, as in Table.settle.
+"""
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from functools import lru_cache
+
+from Cards.Blackjack.blackjack import Shoe
+from Cards.Blackjack.probability import composition, dealer_probabilities
+
+ACTIONS = ('stand', 'hit', 'double', 'split')
+
+HEADER = struct.Struct('<4sIII')
+MAGIC = b'BJEV'
+VERSION = 1
+
+# Table dimensions: total (0-21), soft, pair, upcard value (1-10), action
+SHAPE = (22, 2, 2, 10, len(ACTIONS))
+SIZE = SHAPE[0] * SHAPE[1] * SHAPE[2] * SHAPE[3] * SHAPE[4]
+
+CACHE_DIR = os.environ.get('CARDS_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'Cards'))
+
+
+def _index(total, soft, pair, upcard):
+    return (((total * 2 + soft) * 2 + pair) * 10 + upcard - 1) * len(ACTIONS)
+
+
+def _upcard_value(upcard):
+    if isinstance(upcard, int):
+        return 1 if upcard == 11 else upcard
+    return 1 if upcard.value() == 11 else upcard.value()
+
+
+def solve(counts) -> array:
+    """
+    Solve the expected value of every action for a shoe composition.
+
+    :param counts: tuple; the composition of the full shoe (see probability.composition)
+    :return: array; the flattened table of expected values, nan where an action or state doesn't exist
+    """
+    table = array('d', [float('nan')]) * SIZE
+
+    for upcard in range(1, 11):
+        if not counts[upcard - 1]:
+            continue
+        shoe = counts[:upcard - 1] + (counts[upcard - 1] - 1,) + counts[upcard:]
+        n = sum(shoe)
+        draws = [(value, count / n) for value, count in enumerate(shoe, 1) if count]
+        dealer = dealer_probabilities(shoe, upcard)
+
+        def stand(total):
+            if total > 21:
+                return -1.
+            win = dealer['bust'] + sum([p for outcome, p in dealer.items() if outcome != 'bust' and outcome < total])
+            return 2 * win - 1
+
+        def total(hard, aces):
+            return hard + 10 if aces and hard <= 11 else hard
+
+        @lru_cache(maxsize=None)
+        def hit(hard, aces):
+            return sum([p * best(hard + value, aces or value == 1) for value, p in draws])
+
+        def best(hard, aces):
+            if hard > 21:
+                return -1.
+            return max(stand(total(hard, aces)), hit(hard, aces))
+
+        def double(hard, aces):
+            return 2 * sum([p * stand(total(hard + value, aces or value == 1)) for value, p in draws])
+
+        def split(value):
+            ev = 0.
+            for drawn, p in draws:
+                hard, aces = value + drawn, value == 1 or drawn == 1
+                if total(hard, aces) == 21:
+                    ev += p * 1.5
+                else:
+                    ev += p * max(best(hard, aces), double(hard, aces))
+            return 2 * ev
+
+        states = [(hard, False) for hard in range(4, 22)] + [(hard, True) for hard in range(2, 12)]
+        for hard, aces in states:
+            soft = aces and hard <= 11
+            i = _index(total(hard, aces), soft, False, upcard)
+            table[i:i + 3] = array('d', [stand(total(hard, aces)), hit(hard, aces), double(hard, aces)])
+
+        for value in range(1, 11):
+            hard, aces = 2 * value, value == 1
+            i = _index(total(hard, aces), aces, True, upcard)
+            table[i:i + 4] = array('d', [stand(total(hard, aces)), hit(hard, aces), double(hard, aces),
+                                         split(value)])
+    return table
+
+
+class EVTable:
+    """
+    Expected values of every blackjack action, memory-mapped from a cache file.
+
+    An EVTable is also a strategy for Table.play_round and engine.simulate: call it with (hand, upcard, options).
+    Use load_table to get one.
+
+    :param path: str; the cache file
+    :param decks: int; the number of decks the table was solved for
+    """
+    def __init__(self, path, decks):
+        self.path, self.decks = path, decks
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._values = memoryview(self._mmap)[HEADER.size:].cast('d')
+
+    def __repr__(self):
+        return f"EVTable{{{self.decks} decks}}"
+
+    def __reduce__(self):
+        return load_table, (self.decks, self.path)
+
+    def ev(self, hand, upcard) -> dict:
+        """
+        The expected value of every action that exists for a hand.
+
+        :param hand: Hand; the player's hand
+        :param upcard: Card or int; the dealer's face up card, or its blackjack value
+        :return: dict; action -> expected net chips per chip bet
+        """
+        pair = len(hand) == 2 and hand[0].value() == hand[1].value()
+        i = _index(min(hand.value(), 21), hand.soft(), pair, _upcard_value(upcard))
+        values = self._values[i:i + len(ACTIONS)]
+        return {action: ev for action, ev in zip(ACTIONS, values) if ev == ev}
+
+    def best_action(self, hand, upcard, options=None) -> str:
+        """
+        The action with the highest expected value.
+
+        :param hand: Hand; the player's hand
+        :param upcard: Card or int; the dealer's face up card, or its blackjack value
+        :param options: list; the allowed actions, e.g. from generate_options - if None, any action that exists
+        :return: str; the best action
+        """
+        evs = self.ev(hand, upcard)
+        if len(hand) != 2:
+            evs.pop('double', None)
+        if options is not None:
+            evs = {action: ev for action, ev in evs.items() if action in options}
+        return max(evs, key=evs.get) if evs else 'stand'
+
+    def __call__(self, hand, upcard, options):
+        return self.best_action(hand, upcard, options)
+
+
+def load_table(decks: int = 6, path: str = None) -> EVTable:
+    """
+    Get the expected value table for a number of decks, solving and caching it first if need be.
+
+    :param decks: int; the number of decks in the shoe
+    :param path: str; the cache file - if None, a file in CACHE_DIR
+    :return: EVTable; the table
+    """
+    counts = composition(Shoe(decks=decks, shuffled=False))
+    checksum = zlib.crc32(repr(counts).encode())
+    if path is None:
+        path = os.path.join(CACHE_DIR, f'blackjack-ev-{decks}.bin')
+
+    try:
+        with open(path, 'rb') as f:
+            magic, version, cached_decks, cached_checksum = HEADER.unpack(f.read(HEADER.size))
+        valid = (magic, version, cached_decks, cached_checksum) == (MAGIC, VERSION, decks, checksum)
+    except (OSError, struct.error):
+        valid = False
+
+    if not valid:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp = f'{path}.{os.getpid()}.tmp'
+        with open(temp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, decks, checksum))
+            solve(counts).tofile(f)
+        os.replace(temp, path)
+
+    return EVTable(path, decks)
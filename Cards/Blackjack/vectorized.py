@@ -0,0 +1,144 @@
+"""
+Blackjack hand evaluation over whole batches of hands with NumPy.
+
+Hands are given as an (N hands x max cards) integer matrix of card codes (see Cards.Card.code), padded with 0 where
+a hand has fewer cards. This module needs NumPy, it is not imported by Cards.Blackjack.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Cards.Blackjack.blackjack import Shoe
+
+HandValues = namedtuple("HandValues", ["hard", "soft", "blackjack", "bust"])
+ShoeResults = namedtuple("ShoeResults", ["net", "hands"])
+
+# Card code -> blackjack value with aces counted as 1, 0 for padding
+VALUES = np.array([0 if code < 8 else 1 if code // 4 == 14 else min(code // 4, 10) for code in range(60)],
+                  dtype=np.int16)
+ACE_CODES = 14 * 4
+
+
+def encode(hands, width: int = None) -> np.ndarray:
+    """
+    Turn a list of hands into a matrix of card codes.
+
+    :param hands: list; the hands, each an iterable of Card
+    :param width: int; the number of columns - if None, the length of the longest hand
+    :return: np.ndarray; (len(hands), width) uint8 matrix padded with 0
+    """
+    hands = [[card.code for card in hand] for hand in hands]
+    if width is None:
+        width = max([len(hand) for hand in hands], default=0)
+    codes = np.zeros((len(hands), width), dtype=np.uint8)
+    for i, hand in enumerate(hands):
+        codes[i, :len(hand)] = hand
+    return codes
+
+
+def hand_values(codes) -> HandValues:
+    """
+    Evaluate a batch of blackjack hands.
+
+    The hard total counts every ace as 1. The soft total counts one ace as 11 if that doesn't bust the hand, so it
+    is what Hand.value returns.
+
+    :param codes: array; (N, max cards) matrix of card codes padded with 0
+    :return: HandValues; arrays of hard totals, soft totals, blackjack flags and bust flags, one entry per hand
+    """
+    codes = np.asarray(codes)
+    hard = VALUES[codes].sum(axis=1, dtype=np.int16)
+    aces = (codes >= ACE_CODES).any(axis=1)
+    soft = np.where(aces & (hard <= 11), hard + 10, hard)
+    blackjack = (np.count_nonzero(codes, axis=1) == 2) & (soft == 21)
+    return HandValues(hard, soft, blackjack, hard > 21)
+
+
+def shuffled_shoes(k: int, decks: int = 6, rng=None, shoe=Shoe) -> np.ndarray:
+    """
+    Build k independently shuffled shoes.
+
+    :param k: int; the number of shoes
+    :param decks: int; the number of decks in each shoe
+    :param rng: np.random.Generator or seed; the random number generator
+    :param shoe: type; the Deck subclass that decides which cards make up a deck
+    :return: np.ndarray; (k, cards per shoe) uint8 matrix of card codes
+    """
+    rng = np.random.default_rng(rng)
+    deck = np.array([card.code for card in shoe(shuffled=False)], dtype=np.uint8)
+    shoes = np.tile(deck, (k, decks))
+    return rng.permuted(shoes, axis=1, out=shoes)
+
+
+def _total(hard, aces):
+    return np.where(aces & (hard <= 11), hard + 10, hard)
+
+
+def play_shoes(shoes, stand_on: int = 17, bet: int = 1, penetration: float = 0.25) -> ShoeResults:
+    """
+    Play every shoe through to its cut card in lockstep.
+
+    Each round follows Table.play_round: a burn card, two cards each to the player and the dealer, the player plays
+    dealer-style (hit under stand_on, no doubles or splits) unless the dealer has blackjack, the dealer resolves
+    hitting under 17 and the hand is settled as in Table.settle. A shoe stops once more than penetration of it has
+    been dealt, which is where Table.end_hand reshuffles.
+
+    :param shoes: np.ndarray; (K, cards) matrix of card codes, e.g. from shuffled_shoes
+    :param stand_on: int; the total the player stands on
+    :param bet: int; the bet placed on every round
+    :param penetration: float; the fraction of each shoe dealt before it is finished
+    :return: ShoeResults; the player's net winnings and number of rounds played, per shoe
+    """
+    shoes = np.asarray(shoes)
+    k, n = shoes.shape
+    rows = np.arange(k)
+    cursor = np.zeros(k, dtype=np.intp)
+    cut = penetration * n
+    net = np.zeros(k, dtype=np.int64)
+    hands = np.zeros(k, dtype=np.int64)
+
+    def draw(mask):
+        codes = shoes[rows, np.minimum(cursor, n - 1)]
+        cursor[mask] += 1
+        return np.where(mask, VALUES[codes], 0), mask & (codes >= ACE_CODES)
+
+    active = cursor <= cut
+    while active.any():
+        # Burn a card, then deal the player first, then the dealer
+        cursor[active] += 1
+        player_hard, player_aces = np.zeros(k, dtype=np.int16), np.zeros(k, dtype=bool)
+        dealer_hard, dealer_aces = np.zeros(k, dtype=np.int16), np.zeros(k, dtype=bool)
+        for _ in range(2):
+            value, ace = draw(active)
+            player_hard += value
+            player_aces |= ace
+            value, ace = draw(active)
+            dealer_hard += value
+            dealer_aces |= ace
+
+        player_blackjack = _total(player_hard, player_aces) == 21
+        dealer_blackjack = _total(dealer_hard, dealer_aces) == 21
+
+        hitting = active & ~dealer_blackjack & (_total(player_hard, player_aces) < stand_on)
+        while hitting.any():
+            value, ace = draw(hitting)
+            player_hard += value
+            player_aces |= ace
+            hitting &= _total(player_hard, player_aces) < stand_on
+
+        hitting = active & (_total(dealer_hard, dealer_aces) < 17)
+        while hitting.any():
+            value, ace = draw(hitting)
+            dealer_hard += value
+            dealer_aces |= ace
+            hitting &= _total(dealer_hard, dealer_aces) < 17
+
+        player = _total(player_hard, player_aces)
+        dealer = _total(dealer_hard, dealer_aces)
+        won = (player <= 21) & ((dealer > 21) | (dealer < player))
+        result = np.where(player_blackjack, int(bet * 2.5) - bet, np.where(won, bet, -bet))
+        net += np.where(active, result, 0)
+        hands += active
+
+        active &= cursor <= cut
+    return ShoeResults(net, hands)
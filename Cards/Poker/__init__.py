@@ -0,0 +1,5 @@
+"""
+Shuffle up and deal.
+"""
+from Cards.Poker.poker import *
+from Cards.Poker.evaluator import *
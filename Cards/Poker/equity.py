@@ -0,0 +1,128 @@
+"""
+Texas hold'em equity.
+
+Given every player's hole cards, and optionally some of the board and dead cards, work out how often each player
+wins or ties by the river. When the remaining boards are few enough they are all enumerated, otherwise boards are
+sampled across a pool of processes until the estimate is tight enough. Cards are handled as codes
+(see Cards.Card.code) throughout and scored with evaluator.evaluate_batch, so no Card or Hand is built per board.
+
+This module needs NumPy, it is not imported by Cards.Poker.
+"""
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations, islice
+from math import comb
+
+import numpy as np
+
+from Cards.Poker.evaluator import evaluate_batch
+
+EquityResult = namedtuple("EquityResult", ["win", "tie", "equity", "trials", "exact"])
+
+DECK = tuple(range(8, 60))
+
+
+def _codes(cards):
+    return [card if isinstance(card, int) else card.code for card in cards]
+
+
+def _tally(holes, board, draws):
+    """
+    Count wins, ties and pot shares over a batch of board completions.
+
+    :param holes: np.ndarray; (players, 2) hole card codes
+    :param board: np.ndarray; the known board card codes
+    :param draws: np.ndarray; (boards, cards to come) codes completing the board
+    :return: tuple; wins, ties and equity summed over the boards, one entry per player
+    """
+    boards = np.hstack([np.broadcast_to(board, (len(draws), len(board))), draws])
+    scores = np.stack([evaluate_batch(np.hstack([np.broadcast_to(hole, (len(draws), 2)), boards]))
+                       for hole in holes])
+    winners = scores == scores.max(axis=0)
+    shares = winners.sum(axis=0)
+    wins = (winners & (shares == 1)).sum(axis=1)
+    ties = (winners & (shares > 1)).sum(axis=1)
+    equity = (winners / shares).sum(axis=1)
+    return wins, ties, equity
+
+
+def _enumerate(holes, board, remaining, needed, chunk):
+    if not needed:
+        return np.array(_tally(holes, board, np.zeros((1, 0), dtype=np.uint8)))
+    totals = np.zeros((3, len(holes)))
+    draws = combinations(remaining, needed)
+    while True:
+        batch = np.fromiter(chain.from_iterable(islice(draws, chunk)), dtype=np.uint8).reshape(-1, needed)
+        if not len(batch):
+            return totals
+        totals += _tally(holes, board, batch)
+
+
+def _sample(holes, board, remaining, needed, trials, seed):
+    rng = np.random.default_rng(seed)
+    draws = rng.permuted(np.tile(np.array(remaining, dtype=np.uint8), (trials, 1)), axis=1)[:, :needed]
+    return np.array(_tally(holes, board, draws))
+
+
+def equity(holes, board=(), dead=(), exact_limit: int = 2000000, tolerance: float = 0.001, batch: int = 50000,
+           max_trials: int = 10000000, seed: int = 0, workers: int = None) -> EquityResult:
+    """
+    Work out each player's chances of winning a hold'em hand.
+
+    Every possible board is enumerated if there are at most exact_limit of them. Otherwise boards are sampled in
+    batches across a pool of processes until the 95% confidence interval of every player's equity is within
+    tolerance, or max_trials boards have been played.
+
+    :param holes: list; each player's two hole cards, as codes or Cards, for 2 to 10 players
+    :param board: iterable; the board cards dealt so far
+    :param dead: iterable; other cards known to be out of the deck
+    :param exact_limit: int; the most boards to enumerate
+    :param tolerance: float; the half width of the confidence interval to stop sampling at
+    :param batch: int; the number of boards in each sampled batch
+    :param max_trials: int; the most boards to sample
+    :param seed: int; the master seed for sampling
+    :param workers: int; the number of processes to sample with - if None, one per CPU, if 1, sample in this process
+    :return: EquityResult; win and tie probabilities and equity (ties split) per player
+    """
+    holes = np.array([_codes(hole) for hole in holes], dtype=np.uint8)
+    board = np.array(_codes(board), dtype=np.uint8)
+    known = list(chain(holes.ravel().tolist(), board.tolist(), _codes(dead)))
+    if not 2 <= len(holes) <= 10 or holes.shape[1:] != (2,):
+        raise ValueError("equity needs two hole cards each for 2 to 10 players")
+    if len(board) > 5:
+        raise ValueError("the board has at most five cards")
+    if len(set(known)) != len(known):
+        raise ValueError("the same card can't be dealt twice")
+
+    known = set(known)
+    remaining = [code for code in DECK if code not in known]
+    needed = 5 - len(board)
+
+    if comb(len(remaining), needed) <= exact_limit:
+        totals = _enumerate(holes, board, remaining, needed, batch)
+        trials = comb(len(remaining), needed)
+        return EquityResult(*(totals / trials).tolist(), trials, True)
+
+    master = random.Random(seed)
+    totals, trials = np.zeros((3, len(holes))), 0
+    workers = workers or os.cpu_count()
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while trials < max_trials:
+            # A batch per worker, then check whether the estimate is good enough
+            rounds = min(workers, -(-(max_trials - trials) // batch))
+            seeds = [master.getrandbits(64) for _ in range(rounds)]
+            args = ([holes] * rounds, [board] * rounds, [remaining] * rounds, [needed] * rounds, [batch] * rounds,
+                    seeds)
+            for result in (pool.map(_sample, *args) if pool else map(_sample, *args)):
+                totals += result
+                trials += batch
+            share = totals[2] / trials
+            if (1.96 * np.sqrt(share * (1 - share) / trials)).max() < tolerance:
+                break
+    finally:
+        if pool:
+            pool.shutdown()
+    return EquityResult(*(totals / trials).tolist(), trials, False)
@@ -0,0 +1,180 @@
+"""
+A fast 5 to 7 card poker hand evaluator.
+
+Cards are taken as codes (see Cards.Card.code) or Card objects. Each hand is turned into 13 bit rank masks: one per
+suit, and one for the ranks held at least once, twice, three and four times. Lookup tables over all 8192 masks then
+give straights and the top ranks for kickers, so a hand's strength comes out as a single int: higher is better and
+equal hands score the same.
+
+evaluate_batch does the same over a NumPy array of hands, NumPy is only needed for that.
+"""
+CATEGORIES = ('high card', 'pair', 'two pair', 'three of a kind', 'straight', 'flush', 'full house',
+              'four of a kind', 'straight flush')
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+
+_MASKS = 1 << 13
+
+
+def _tops(n):
+    """
+    For every rank mask, the mask of its n highest ranks.
+    """
+    tops = [[0] * _MASKS]
+    for k in range(1, n + 1):
+        fewer = tops[-1]
+        tops.append([0] + [1 << (mask.bit_length() - 1) | fewer[mask & ~(1 << (mask.bit_length() - 1))]
+                           for mask in range(1, _MASKS)])
+    return tops
+
+
+def _straight(mask):
+    """
+    The bit of the high card of the best straight in a rank mask, 0 if there isn't one.
+    """
+    for high in range(12, 3, -1):
+        run = 0b11111 << (high - 4)
+        if mask & run == run:
+            return 1 << high
+    # The wheel, A-2-3-4-5, is five high
+    return 1 << 3 if mask & 0b1000000001111 == 0b1000000001111 else 0
+
+
+_TOP = dict(enumerate(_tops(5)))
+_STRAIGHT = [_straight(mask) for mask in range(_MASKS)]
+_BITS = [bin(mask).count('1') for mask in range(_MASKS)]
+
+
+def _score(category, primary, kicker=0):
+    return category << 26 | primary << 13 | kicker
+
+
+def evaluate(cards) -> int:
+    """
+    Score a poker hand of 5 to 7 cards.
+
+    :param cards: iterable; card codes or Cards
+    :return: int; the hand's strength, higher is better
+    """
+    suits = [0, 0, 0, 0]
+    once = twice = thrice = four = 0
+    for card in cards:
+        if not isinstance(card, int):
+            card = card.code
+        bit = 1 << ((card >> 2) - 2)
+        suits[card & 3] |= bit
+        four |= thrice & bit
+        thrice |= twice & bit
+        twice |= once & bit
+        once |= bit
+
+    for suit in suits:
+        if _BITS[suit] >= 5:
+            straight = _STRAIGHT[suit]
+            if straight:
+                return _score(STRAIGHT_FLUSH, straight)
+            flush = suit
+            break
+    else:
+        flush = 0
+
+    if four:
+        return _score(QUADS, four, _TOP[1][once & ~four])
+    trips = thrice & ~four
+    pairs = twice & ~thrice
+    if trips:
+        best = _TOP[1][trips]
+        pair = _TOP[1][(trips & ~best) | pairs]
+        if pair:
+            return _score(FULL_HOUSE, best, pair)
+    if flush:
+        return _score(FLUSH, _TOP[5][flush])
+    straight = _STRAIGHT[once]
+    if straight:
+        return _score(STRAIGHT, straight)
+    if trips:
+        return _score(TRIPS, trips, _TOP[2][once & ~trips])
+    if _BITS[pairs] >= 2:
+        best = _TOP[2][pairs]
+        return _score(TWO_PAIR, best, _TOP[1][once & ~best])
+    if pairs:
+        return _score(PAIR, pairs, _TOP[3][once & ~pairs])
+    return _score(HIGH_CARD, _TOP[5][once])
+
+
+def category(score: int) -> str:
+    """
+    The name of the category of a score from evaluate, e.g. 'full house'.
+    """
+    return CATEGORIES[score >> 26]
+
+
+_arrays = {}
+
+
+def _tables():
+    """
+    The lookup tables as NumPy arrays, built on first use.
+    """
+    if not _arrays:
+        import numpy as np
+        codes = range(60)
+        _arrays.update({
+            'top': {n: np.array(table, dtype=np.int32) for n, table in _TOP.items()},
+            'straight': np.array(_STRAIGHT, dtype=np.int32),
+            'bits': np.array(_BITS, dtype=np.int8),
+            # Card code -> rank bit, and rank bit shifted into a 16 bit lane per suit
+            'rank': np.array([1 << (code // 4 - 2) if code >= 8 else 0 for code in codes], dtype=np.uint16),
+            'suit': np.array([1 << (code // 4 - 2 + 16 * (code % 4)) if code >= 8 else 0 for code in codes],
+                             dtype=np.uint64),
+        })
+    return _arrays
+
+
+def evaluate_batch(codes):
+    """
+    Score many poker hands at once.
+
+    :param codes: array; (N, 5 to 7) integer array of card codes
+    :return: np.ndarray; int32 scores, the same as evaluate gives for each row
+    """
+    import numpy as np
+
+    tables = _tables()
+    top, straights, bits = tables['top'], tables['straight'], tables['bits']
+
+    codes = np.asarray(codes)
+    ranks = tables['rank'][codes]
+    lanes = np.bitwise_or.reduce(tables['suit'][codes], axis=1)
+
+    once = ranks[:, 0].copy()
+    twice, thrice, four = [np.zeros(len(codes), dtype=np.uint16) for _ in range(3)]
+    for column in ranks.T[1:]:
+        four |= thrice & column
+        thrice |= twice & column
+        twice |= once & column
+        once |= column
+
+    flush = np.zeros(len(codes), dtype=np.uint16)
+    for s in range(4):
+        suit = (lanes >> np.uint64(16 * s)).astype(np.uint16)
+        flush = np.where(bits[suit] >= 5, suit, flush)
+    trips = thrice & ~four
+    pairs = twice & ~thrice
+    best_trips = top[1][trips]
+    full_pair = top[1][(trips & ~best_trips.astype(np.uint16)) | pairs]
+    best_pairs = top[2][pairs]
+    once, pairs, trips, four = [mask.astype(np.int32) for mask in (once, pairs, trips, four)]
+
+    # From worst to best, so each better category overwrites the last
+    score = HIGH_CARD << 26 | top[5][once] << 13
+    score = np.where(pairs != 0, PAIR << 26 | pairs << 13 | top[3][once & ~pairs], score)
+    score = np.where(bits[pairs] >= 2, TWO_PAIR << 26 | best_pairs << 13 | top[1][once & ~best_pairs], score)
+    score = np.where(trips != 0, TRIPS << 26 | trips << 13 | top[2][once & ~trips], score)
+    straight = straights[once]
+    score = np.where(straight != 0, STRAIGHT << 26 | straight << 13, score)
+    score = np.where(flush != 0, FLUSH << 26 | top[5][flush] << 13, score)
+    score = np.where((trips != 0) & (full_pair != 0), FULL_HOUSE << 26 | best_trips << 13 | full_pair, score)
+    score = np.where(four != 0, QUADS << 26 | four << 13 | top[1][once & ~four], score)
+    straight_flush = straights[flush]
+    return np.where(straight_flush != 0, STRAIGHT_FLUSH << 26 | straight_flush << 13, score)
@@ -0,0 +1,25 @@
+"""
+This module has poker hands
+"""
+import Cards
+from Cards.Poker.evaluator import category, evaluate
+
+
+class Hand(Cards.Hand):
+    """
+    A poker hand.
+
+    Child of Cards.Hand, adds method value for ranking hands of 5 to 7 cards.
+    """
+    def value(self):
+        """
+        evaluate a poker hand
+        :return: int; the strength of the best five cards, higher is better
+        """
+        return evaluate(self.cards)
+
+    def category(self):
+        """
+        The name of the hand, e.g. 'two pair'.
+        """
+        return category(self.value())
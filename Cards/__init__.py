@@ -1,5 +1,20 @@
 """
 Hey Ma! Check out my new package about Cards!
+
+The games are subpackages that are only imported when first used, e.g. Cards.Blackjack, so import Cards stays fast.
 """
+import importlib
+
 from Cards.base import *
-import Cards.Blackjack
+
+_submodules = ('Blackjack', 'Poker', 'shuffling')
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f"Cards.{name}")
+    raise AttributeError(f"module 'Cards' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules))
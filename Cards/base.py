@@ -1,4 +1,6 @@
+import copy
 import random
+from array import array
 
 # Global variables
 s_map = {
@@ -11,6 +13,7 @@ p_map = {
     **dict(zip(range(2, 15), range(2, 15))),
     **dict(zip([str(i) for i in range(2, 15)], range(2, 15))),
     **{
+        't': 10, 'ten': 10,
         'j': 11, 'jack': 11,
         'q': 12, 'queen': 12,
         'k': 13, 'king': 13,
@@ -19,46 +22,96 @@ p_map = {
 }
 
 
+# Display tables, shared by every Card
+suit_opts = {
+    'unicode': {0: u'\u2660', 1: u'\u2661', 2: u'\u2662', 3: u'\u2663'},
+    'letter': {0: 'S', 1: 'H', 2: 'D', 3: 'C'},
+    'word': {0: 'Spades', 1: 'Hearts', 2: 'Diamonds', 3: 'Clubs'}
+}
+pip_opts = {
+    'letter': {**dict(zip(range(2, 11), [str(n) for n in range(2, 11)])), **{11: 'J', 12: 'Q', 13: 'K', 14: 'A'}},
+    'word': {2: "Two", 3: "Three", 4: "Four", 5: "Five", 6: "Six", 7: "Seven", 8: "Eight", 9: "Nine",
+             10: "Ten", 11: "Jack", 12: "Queen", 13: "King", 14: "Ace"}
+}
+
+
 class Card:
     """
     A playing card.
 
     Aces always mapped to pip==14.
-    Use set_option to change default display options.
+    Cards are immutable and interned: asking for the same card twice returns the same object, so a deck of
+    any size only holds references to a handful of Card instances.
+    Use set_option to get the same card with different display options.
 
     :param pip: str or int; the rank of the card
     :param suit: str; the suit of the card
     :param display_pip: str; default="letter"; user setting for default repr and str of pip value
     :param display_suit: str; default="unicode"; user setting for default repr and str of suit value
     """
-    def __init__(self, pip, suit, display_pip="letter", display_suit="unicode"):
-        if str(pip).lower() in p_map:
-            self.pip = p_map[str(pip).lower()]
-        else:
-            self.pip = int(pip)
+    __slots__ = ('pip', 'suit', 'display_pip', 'display_suit')
 
-        if self.pip > 14:
-            raise TypeError("a Card type must have a pip less than 15.")
-        self.suit = s_map[str(suit).lower()]
+    suit_opts = suit_opts
+    pip_opts = pip_opts
 
-        self.suit_opts = {'unicode': {0: u'\u2660', 1: u'\u2661', 2: u'\u2662', 3: u'\u2663'},
-                          'letter': {0: 'S', 1: 'H', 2: 'D', 3: 'C'},
-                          'word': {0: 'Spades', 1: 'Spades'}
-                          }
+    _interned = {}
 
-        nums = dict(zip(range(2, 11), [str(n) for n in range(2, 11)]))
-        self.pip_opts = {'letter': {**nums, **{11: 'J', 12: 'Q', 13: 'K', 14: 'A'}},
-                         'word': {2: "Two", 3: "Three", 4: "Four", 5: "Five", 6: "Six", 7: "Seven", 8: "Eight",
-                                  9: "Nine",
-                                  10: "Ten", 11: "Jack", 12: "Queen", 13: "King", 14: "Ace"}
-                         }
+    def __new__(cls, pip, suit, display_pip="letter", display_suit="unicode"):
+        key = (cls, pip, suit, display_pip, display_suit)
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments can't be used as a shortcut, resolve them the long way
+            key = None
 
-        self.display_pip, self.display_suit = None, None  # Initialise before setting
-        self.set_option(display_suit=display_suit, display_pip=display_pip)
+        if str(pip).lower() in p_map:
+            pip_value = p_map[str(pip).lower()]
+        else:
+            pip_value = int(pip)
+
+        if pip_value > 14:
+            raise TypeError("a Card type must have a pip less than 15.")
+        suit_value = s_map[str(suit).lower()]
+
+        if str(display_pip).lower() not in cls.pip_opts:
+            raise TypeError(
+                f'"{display_pip}" is not a valid display_pip option. Try using '
+                f'{", ".join(list(cls.pip_opts)[:-1])} or {list(cls.pip_opts)[-1]}.'
+            )
+        if str(display_suit).lower() not in cls.suit_opts:
+            raise TypeError(
+                f'"{display_suit}" is not a valid display_suit option. Try using '
+                f'{", ".join(list(cls.suit_opts)[:-1])} or {list(cls.suit_opts)[-1]}.'
+            )
+
+        canonical = (cls, pip_value, suit_value, str(display_pip).lower(), str(display_suit).lower())
+        card = cls._interned.get(canonical)
+        if card is None:
+            card = object.__new__(cls)
+            for attr, value in zip(Card.__slots__, canonical[1:]):
+                object.__setattr__(card, attr, value)
+            cls._interned[canonical] = card
+        if key is not None:
+            cls._interned[key] = card
+        return card
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable, use set_option to change display options")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.pip, self.suit, self.display_pip, self.display_suit)
 
     def set_option(self, **kwargs):
         """
-        This method sets the default display options
+        Get this card with different display options.
+
+        Cards are immutable, so this returns the interned card rather than changing this one.
+        :return: Card; the same card with the new display options
         """
         handles = ("display_pip", "display_suit")
 
@@ -67,23 +120,11 @@ class Card:
                 raise TypeError(f'"{key}" is not a valid option to set. You can use set options to change '
                                 f'{", ".join(handles[:-1])} or {handles[-1]}.')
 
-        if "display_pip" in kwargs:
-            if str(kwargs["display_pip"]).lower() in self.pip_opts:
-                self.display_pip = str(kwargs["display_pip"]).lower()
-            else:
-                raise TypeError(
-                    f'"{kwargs["display_pip"]}" is not a valid display_pip option. Try using '
-                    f'{", ".join(list(self.pip_opts)[:-1])} or {list(self.pip_opts)[-1]}.'
-                )
-
-        if "display_suit" in kwargs:
-            if str(kwargs["display_suit"]).lower() in self.suit_opts:
-                self.display_suit = str(kwargs["display_suit"]).lower()
-            else:
-                raise TypeError(
-                    f'"{kwargs["display_suit"]}" is not a valid display_suit option. Try using '
-                    f'{", ".join(list(self.suit_opts)[:-1])} or {list(self.suit_opts)[-1]}.'
-                )
+        return type(self)(
+            self.pip, self.suit,
+            display_pip=kwargs.get("display_pip", self.display_pip),
+            display_suit=kwargs.get("display_suit", self.display_suit)
+        )
 
     def __str__(self):
         if (self.display_pip == "word") or (self.display_suit == "word"):
@@ -115,6 +156,156 @@ class Card:
     def __hash__(self):
         return hash((self.pip, self.suit, type(self).__name__))
 
+    @property
+    def code(self):
+        """
+        The card as a small integer, pip*4 + suit.
+        """
+        return self.pip * 4 + self.suit
+
+    @classmethod
+    def from_code(cls, code, display_pip="letter", display_suit="unicode"):
+        """
+        Get the card encoded by code (see Card.code).
+        """
+        return cls.code_table(display_pip, display_suit)[code]
+
+    @classmethod
+    def code_table(cls, display_pip="letter", display_suit="unicode"):
+        """
+        A list mapping every card code to its interned card, None for codes that aren't cards.
+
+        The tables are built once per card type and display options.
+        """
+        key = (cls, display_pip, display_suit)
+        if key not in _code_tables:
+            _code_tables[key] = [
+                cls(code // 4, code % 4, display_pip=display_pip, display_suit=display_suit) if code >= 8 else None
+                for code in range(60)
+            ]
+        return _code_tables[key]
+
+
+_code_tables = {}
+
+
+# Card text, e.g. "As", "TH" or "10♣": a pip then a suit, in any case
+_text_pips = {**{str(pip): pip for pip in range(2, 11)}, 't': 10, 'j': 11, 'q': 12, 'k': 13, 'a': 14}
+_text_suits = {'s': 0, 'h': 1, 'd': 2, 'c': 3, **{chr(0x2660 + i): i % 4 for i in range(8)}}
+_text_codes = {pip + suit: p * 4 + s for pip, p in _text_pips.items() for suit, s in _text_suits.items()}
+_text_separators = str.maketrans('', '', ' ,;|\t\r\n')
+_code_text = [None] * 8 + [('T' if code // 4 == 10 else pip_opts['letter'][code // 4]) + 'SHDC'[code % 4]
+                           for code in range(8, 60)]
+
+
+def parse_codes(text: str, strict: bool = True) -> array:
+    """
+    Read cards from text into an array of card codes (see Card.code).
+
+    Cards are a pip (2-10, T, J, Q, K or A) and a suit (S, H, D, C or a suit symbol), in any case, and may be run
+    together or separated by spaces, commas, semicolons, bars or new lines, e.g. "AsKd" or "TH 9C".
+
+    :param text: str; the cards
+    :param strict: bool; raise ValueError if the text has anything else in it - if False, skip it
+    :return: array; the card codes in order
+    """
+    text = text.lower()
+    try:
+        # Cards separated by white space are common and just need looking up
+        return array('B', map(_text_codes.__getitem__, text.split()))
+    except KeyError:
+        pass
+    token = _text_token()
+    tokens = token.findall(text)
+    if strict and token.sub('', text).translate(_text_separators):
+        raise ValueError(f'"{text}" has something in it that is not a card')
+    return array('B', map(_text_codes.__getitem__, tokens))
+
+
+def _text_token():
+    """
+    The regular expression for one card, compiled on first use as re is slow to import.
+    """
+    if _text_token.pattern is None:
+        import re
+
+        _text_token.pattern = re.compile(f"(?:10|[2-9tjqka])[{''.join(_text_suits)}]")
+    return _text_token.pattern
+
+
+_text_token.pattern = None
+
+
+def format_codes(codes, sep: str = " ") -> str:
+    """
+    Write card codes as text that parse_codes reads back, e.g. "AS KD TH".
+    """
+    return sep.join([_code_text[code] for code in codes])
+
+
+def parse_codes_batch(data, lines: bool = False):
+    """
+    Read every card in a big block of text at once with NumPy, e.g. a whole file of recorded hands.
+
+    Takes the same card text as parse_codes, but anything that isn't a card is skipped rather than checked, so
+    the text should only hold cards and separators.
+
+    :param data: bytes or str; the text, UTF-8 if bytes
+    :param lines: bool; also return the line each card is on
+    :return: np.ndarray; the card codes as uint8 - with lines, also the line numbers, counting from 0
+    """
+    import numpy as np
+
+    pip_lut, suit_lut = _batch_tables()
+    buf = np.frombuffer(data.encode() if isinstance(data, str) else data, dtype=np.uint8)
+
+    # ASCII suits follow their pip, the last byte of a UTF-8 suit symbol (E2 99 A0-A7) is three bytes after it
+    ends = np.flatnonzero(np.take(suit_lut, buf[1:])) + 1
+    suits = np.take(suit_lut, buf[ends]) - 1
+    starts = ends - 1
+    if (buf == 0xE2).any():
+        symbols = np.flatnonzero((buf[2:] >= 0xA0) & (buf[2:] <= 0xA7) & (buf[1:-1] == 0x99) & (buf[:-2] == 0xE2)) + 2
+        symbols = symbols[symbols >= 3]
+        ends = np.concatenate([ends, symbols])
+        suits = np.concatenate([suits, (buf[symbols] - 0xA0) & 3])
+        starts = np.concatenate([starts, symbols - 3])
+        order = np.argsort(ends, kind='stable')
+        ends, suits, starts = ends[order], suits[order], starts[order]
+
+    pips = np.take(pip_lut, buf[starts])
+    # A 0 is only a pip as the end of 10
+    zeros = np.flatnonzero(pips == 0xFF)
+    if len(zeros):
+        pips[zeros] = np.where((starts[zeros] > 0) & (buf[np.maximum(starts[zeros] - 1, 0)] == ord('1')), 10, 0)
+    valid = pips > 0
+    codes = pips[valid] * 4 + suits[valid]
+    if not lines:
+        return codes
+    return codes, np.searchsorted(np.flatnonzero(buf == ord('\n')), ends[valid])
+
+
+def _batch_tables():
+    """
+    Byte -> pip and byte -> suit + 1 lookup tables for parse_codes_batch, 0 where the byte isn't one.
+    """
+    import numpy as np
+
+    if not _batch_tables.cache:
+        pip_lut = np.zeros(256, dtype=np.uint8)
+        suit_lut = np.zeros(256, dtype=np.uint8)
+        for text, pip in _text_pips.items():
+            if len(text) == 1:
+                pip_lut[ord(text)] = pip_lut[ord(text.upper())] = pip
+        pip_lut[ord('0')] = 0xFF
+        for text, suit in _text_suits.items():
+            if text.isascii():
+                suit_lut[ord(text)] = suit_lut[ord(text.upper())] = suit + 1
+        _batch_tables.cache = pip_lut, suit_lut
+    return _batch_tables.cache
+
+
+_batch_tables.cache = None
+
 
 # A class that simulates a hand of cards. Kept general to be used as a parent class for specific games.
 class Hand:
@@ -123,7 +314,15 @@ class Hand:
 
     This class takes in Card arguments and stores them as a list
     :param args: Card; the Cards that constitute the Hand
+
+    suit, pip and sorted return HandViews rather than copying cards, slicing still returns a Hand. Which positions
+    hold each suit and pip is indexed as bitmasks the first time it's asked for, and re-indexed after append or
+    restore, or once cards is replaced. Change the cards with those rather than changing hand.cards in place.
     """
+    card_type = Card
+    # (cards, number of cards, suit masks, pip masks, cached positions) - see _indexed
+    _index = None
+
     def __init__(self, *args):
         self.cards = [card for card in args if isinstance(card, Card)]
 
@@ -149,15 +348,64 @@ class Hand:
         else:
             return self.cards.__getitem__(item)
 
+    def _indexed(self):
+        """
+        The hand's index, built again if it was cleared or cards was replaced since it was last built.
+        """
+        index = self._index
+        cards = self.cards
+        if index is None or index[0] is not cards or index[1] != len(cards):
+            suits, pips = [0] * 4, [0] * 15
+            for i, card in enumerate(cards):
+                suits[card.suit] |= 1 << i
+                pips[card.pip] |= 1 << i
+            index = self._index = (cards, len(cards), suits, pips, {})
+        return index
+
+    def _positions(self, key, mask):
+        cache = self._index[4]
+        if key not in cache:
+            cache[key] = tuple([i for i in range(mask.bit_length()) if mask >> i & 1])
+        return cache[key]
+
+    def suit_mask(self, suit) -> int:
+        """
+        The positions of the cards of a suit, as a bitmask with bit i set for self.cards[i].
+        """
+        return self._indexed()[2][s_map[suit]]
+
+    def pip_mask(self, pip) -> int:
+        """
+        The positions of the cards of a pip, as a bitmask with bit i set for self.cards[i].
+        """
+        return self._indexed()[3][p_map[pip]]
+
+    def suit_count(self, suit) -> int:
+        return bin(self.suit_mask(suit)).count('1')
+
+    def pip_count(self, pip) -> int:
+        return bin(self.pip_mask(pip)).count('1')
+
     def suit(self, suit):
-        return self.subset(*[card for card in self if card.suit == s_map[suit]])
+        """
+        A view of the cards of a suit.
+        """
+        suit = s_map[suit]
+        index = self._indexed()
+        return HandView(type(self), index[0], self._positions(('suit', suit), index[2][suit]))
 
     def pip(self, pip):
-        return self.subset(*[card for card in self if card.pip == p_map[pip]])
+        """
+        A view of the cards of a pip.
+        """
+        pip = p_map[pip]
+        index = self._indexed()
+        return HandView(type(self), index[0], self._positions(('pip', pip), index[3][pip]))
 
     def append(self, item):
         if isinstance(item, Card):
             self.cards.append(item)
+            self._index = None
         else:
             raise TypeError(f'can only append Card (not "{type(item).__name__}") to {type(self).__name__}')
 
@@ -168,15 +416,120 @@ class Hand:
             raise TypeError(f'can only concatenate Hand or subclass of Hand (not "{type(other).__name__}" to '
                             f'{type(self).__name__}')
 
+    @classmethod
+    def from_string(cls, text: str):
+        """
+        Make a hand from text like "AsKd" or "TH 9C", see parse_codes.
+        """
+        table = cls.card_type.code_table()
+        return cls(*[table[code] for code in parse_codes(text)])
+
+    def to_string(self, sep: str = " ") -> str:
+        return format_codes([card.code for card in self.cards], sep)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        Make a hand from card codes, one byte each (see Card.code).
+        """
+        table = cls.card_type.code_table()
+        cards = [table[code] for code in data]
+        if None in cards:
+            raise ValueError("card codes run from 8 to 59")
+        return cls(*cards)
+
+    def to_bytes(self) -> bytes:
+        return bytes([card.code for card in self.cards])
+
+    def snapshot(self) -> tuple:
+        """
+        The cards in the hand, to go back to with restore. Cards are immutable, so nothing else needs copying.
+        """
+        return tuple(self.cards)
+
+    def restore(self, snapshot):
+        self.cards = list(snapshot)
+        self._index = None
+
     def sorted(self, reverse=True):
-        temp = self.cards
-        temp.sort(reverse=reverse)
-        return self.subset(*temp)
+        """
+        A view of the cards sorted by pip, highest first unless reverse is False. The hand itself isn't changed.
+        """
+        cards, n, suits, pips, cache = self._indexed()
+        key = ('sorted', reverse)
+        if key not in cache:
+            cache[key] = tuple(sorted(range(n), key=lambda i: cards[i].pip, reverse=reverse))
+        return HandView(type(self), cards, cache[key])
 
     def __bool__(self):
         return bool(self.cards)
 
 
+class HandView:
+    """
+    Some of a hand's cards, in some order, without copying them.
+
+    A view keeps the hand's list of cards and the positions it shows, so it stays valid while the hand is only
+    appended to. It reads like a Hand, and anything else a Hand can do (e.g. value) is done on a copy, see hand.
+    Views are read only: the methods that change a hand raise TypeError rather than changing a copy, and cards is
+    a new list. To change the cards, change the hand or a copy from hand().
+
+    :param hand_type: type; the type of the hand the view is of
+    :param cards: list; the hand's cards
+    :param positions: range or tuple; the positions in cards to show, in order
+    """
+    __slots__ = ('_hand_type', '_cards', '_positions')
+    # Hand methods that change the hand, which would only change the copy
+    _mutators = frozenset(('append', 'restore'))
+
+    def __init__(self, hand_type, cards, positions):
+        self._hand_type = hand_type
+        self._cards = cards
+        self._positions = positions
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self):
+        return "Hand[" + ", ".join([str(card) for card in self]) + "]"
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __bool__(self):
+        return bool(self._positions)
+
+    def __iter__(self):
+        cards = self._cards
+        return (cards[i] for i in self._positions)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return HandView(self._hand_type, self._cards, self._positions[item])
+        return self._cards[self._positions[item]]
+
+    @property
+    def cards(self) -> list:
+        cards = self._cards
+        return [cards[i] for i in self._positions]
+
+    def hand(self):
+        """
+        Copy the cards into a hand of the type the view is of.
+        """
+        return self._hand_type(*self.cards)
+
+    def __add__(self, other):
+        return self.hand() + other
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in self._mutators:
+            raise TypeError(f"a view of a hand can't {name}, use hand() for a copy that can")
+        return getattr(self.hand(), name)
+
+
 class Deck:
     """
     A deck of cards.
@@ -184,39 +537,150 @@ class Deck:
     This is a standard 52 cards deck. Jokers not included.
     Use kwarg card to make your own custom deck.
 
+    With compact=True the cards are stored as one byte codes (see Card.code) in an array and only turned back
+    into Card objects when they are read. Big multi-deck shoes then cost a byte per card and concatenation is
+    a single copy. Compact decks show every card with the deck's suit_format.
+
     :param cards: list; a list of cards to form a custom deck - if None, will generate a standard deck
     :param decks: int; the number of decks
     :param shuffled: bool; whether or not you want the deck shuffled
+    :param compact: bool; whether to store the cards as an array of codes
+    :param rng: random.Random; the random number generator used to shuffle - if None, uses the random module. Any
+        object with a shuffle(cards) method will do, see Cards.shuffling for other shuffle backends
+
+    Objects in the trackers list are told about every card as it leaves the deck through tracker.seen(card), e.g.
+    to keep a card count.
     """
-    def __init__(self, cards:list = None, decks:int = 1, shuffled:bool = True, suit_format="unicode"):
+    card_type = Card
+    pips = range(2, 15)
+
+    def __init__(self, cards: list = None, decks: int = 1, shuffled: bool = True, suit_format="unicode",
+                 compact: bool = False, rng=None):
+        self.suit_format = suit_format
+        self.compact = compact
+        self.rng = rng
+        self.trackers = []
+        self._decode = self.card_type.code_table(display_suit=suit_format)
+
         if cards is None:
-            self.cards = [
-                Card(pip, suit, display_suit=suit_format) for pip in range(2, 15) for suit in ('S', 'H', 'D', 'C')
-            ] * decks
-        else:
-            self.cards = cards * decks
+            cards = [self.card_type(pip, suit, display_suit=suit_format) for pip in self.pips for suit in range(4)]
+
+        self.cards = cards * decks if isinstance(cards, (list, array)) else list(cards) * decks
 
         if shuffled:
-            random.shuffle(self.cards)
+            self.shuffle()
+
+    @property
+    def cards(self):
+        """
+        The cards left in the deck, as a new list of Card. Reading it doesn't change the deck, and neither does
+        changing the list: assign to cards, or use append, del and shuffle.
+        """
+        if self.compact:
+            return [self._decode[code] for code in self._remaining()]
+        return self._cards[self._top:]
+
+    @cards.setter
+    def cards(self, cards):
+        if self.compact:
+            if isinstance(cards, array) and cards.typecode == 'B':
+                self._cards = cards
+            else:
+                self._cards = array('B', [card.code for card in cards])
+        else:
+            if isinstance(cards, array):
+                cards = [self._decode[code] for code in cards]
+            self._cards = cards
+        # Dealing moves this cursor along rather than deleting from the front of self._cards
+        self._top = 0
+        # Set when self._cards is also held by a snapshot or a fork, it is copied before it's next changed
+        self._shared = False
+
+    @classmethod
+    def from_bytes(cls, data: bytes, shuffled: bool = False, **kwargs):
+        """
+        Make a deck from card codes, one byte each (see Card.code), top card first.
+
+        With compact=True the bytes are copied straight into the deck's storage without making any Cards.
+
+        :param data: bytes; the card codes
+        :param shuffled: bool; whether to shuffle the deck
+        :param kwargs: passed on to the deck, e.g. compact or rng
+        """
+        if data and (min(data) < 8 or max(data) > 59):
+            raise ValueError("card codes run from 8 to 59")
+        return cls(cards=array('B', data), shuffled=shuffled, **kwargs)
+
+    def to_bytes(self) -> bytes:
+        """
+        The card codes left in the deck, one byte each, top card first.
+        """
+        if self.compact:
+            return self._remaining().tobytes()
+        return bytes([card.code for card in self._remaining()])
+
+    @classmethod
+    def from_string(cls, text: str, shuffled: bool = False, **kwargs):
+        """
+        Make a deck from text like "AsKd TH", top card first, see parse_codes.
+        """
+        return cls(cards=parse_codes(text), shuffled=shuffled, **kwargs)
+
+    def to_string(self, sep: str = " ") -> str:
+        return format_codes(self.to_bytes(), sep)
+
+    def _drop_dealt(self):
+        """
+        Throw away the cards that have already been dealt off the top.
+        """
+        if self._shared:
+            self._cards = self._cards[self._top:]
+            self._top = 0
+            self._shared = False
+        elif self._top:
+            del self._cards[:self._top]
+            self._top = 0
+
+    def _remaining(self):
+        return self._cards[self._top:] if self._top else self._cards
 
     def __len__(self):
-        return len(self.cards)
+        return len(self._cards) - self._top
 
     def __add__(self, other):
         try:
-            return Deck(cards=self.cards + other.cards)
-        except TypeError:
+            if self.compact and getattr(other, 'compact', False):
+                cards = self._remaining() + other._remaining()
+            elif self.compact:
+                cards = self._remaining() + array('B', [card.code for card in other.cards])
+            else:
+                cards = self._remaining() + other.cards
+        except (TypeError, AttributeError):
             raise TypeError(f'can only concatenate Deck (not "{type(other).__name__}" to '
                             f'{type(self).__name__}')
+        return type(self)(cards=cards, suit_format=self.suit_format, compact=self.compact, rng=self.rng)
 
     def __mul__(self, other):
-        return Deck(cards=self.cards * other)
+        return type(self)(cards=self._remaining() * other, suit_format=self.suit_format, compact=self.compact,
+                          rng=self.rng)
 
     def __getitem__(self, item):
-        return self.cards[item]
+        if isinstance(item, slice):
+            cards = self._remaining()[item]
+            return [self._decode[code] for code in cards] if self.compact else cards
+        if item < 0:
+            item += len(self)
+            if item < 0:
+                raise IndexError(f"{type(self).__name__} index out of range")
+        card = self._cards[self._top + item]
+        return self._decode[card] if self.compact else card
 
     def __delitem__(self, key):
-        del self.cards[key]
+        if key == 0 and len(self):
+            self._top += 1
+        else:
+            self._drop_dealt()
+            del self._cards[key]
 
     def __str__(self):
         return r"Deck{" + f"{len(self)} cards" + r"}"
@@ -228,26 +692,125 @@ class Deck:
         """
         Show the top n cards if the user wants to see them
         """
-        return r"Deck{" + f"{', '.join([str(card) for card in self.cards[:n]] + ['...'])}" + r"}"
+        return r"Deck{" + f"{', '.join([str(card) for card in self[:n]] + ['...'])}" + r"}"
 
     def append(self, item):
         if isinstance(item, Card):
-            self.cards.append(item)
+            if self._shared:
+                self._drop_dealt()
+            self._cards.append(item.code if self.compact else item)
         else:
             raise TypeError(f'can only append Card (not "{type(item).__name__}") to {type(self).__name__}')
 
+    def snapshot(self):
+        """
+        Capture the order of the cards left in the deck, to go back to with restore.
+
+        No cards are copied: the snapshot holds the deck's storage and the position of the top card, and the deck
+        copies its storage before it next changes it.
+
+        :return: tuple; the snapshot
+        """
+        self._shared = True
+        return self._cards, self._top
+
+    def restore(self, snapshot):
+        """
+        Put the deck back to a snapshot, see snapshot. Trackers are not rewound.
+        """
+        self._cards, self._top = snapshot
+        self._shared = True
+
+    def fork(self, rng=None):
+        """
+        A copy of the deck that deals the same cards, without copying them until either deck is changed.
+
+        The copy gets its own trackers and random number generator, so the two can be used independently.
+
+        :param rng: random.Random; the copy's random number generator - if None, a copy of this deck's
+        :return: Deck; the copy
+        """
+        fork = copy.copy(self)
+        self._shared = fork._shared = True
+        if rng is not None:
+            fork.rng = rng
+        elif self.rng is not None:
+            fork.rng = copy.copy(self.rng)
+        fork.trackers = copy.deepcopy(self.trackers) if self.trackers else []
+        return fork
+
     def shuffle(self):
-        random.shuffle(self.cards)
+        self._drop_dealt()
+        (random if self.rng is None else self.rng).shuffle(self._cards)
+
+    def _gather(self, discards):
+        """
+        Get the cards dealt since the deck was last shuffled back in front of the cursor, ready to be put back.
+
+        They are normally still there, as dealing only moves the cursor. If some have been thrown away (see
+        _drop_dealt) the discards are put in their place, otherwise the discards are only counted.
+        """
+        if discards is not None and len(discards) != self._top:
+            self._drop_dealt()
+            if self.compact:
+                self._cards[:0] = array('B', [card.code for card in discards])
+            else:
+                self._cards[:0] = list(discards)
+            self._top = len(discards)
+        elif self._shared:
+            self._cards = self._cards[:]
+            self._shared = False
+
+    def reshuffle(self, discards=None):
+        """
+        Put the dealt cards back and shuffle the whole deck, reusing its storage rather than building a new deck.
+
+        :param discards: Deck; the cards dealt since the last shuffle, only used if the deck no longer holds them
+        """
+        self._gather(discards)
+        self._top = 0
+        (random if self.rng is None else self.rng).shuffle(self._cards)
+
+    def reinsert(self, discards=None):
+        """
+        Put the dealt cards back at random places in the deck, as a continuous shuffling machine does.
+
+        The dealt cards swap places with random cards anywhere in the deck, a partial Fisher-Yates shuffle, so it
+        only costs as much as the number of cards put back. The rng needs a randrange method for this, as
+        random.Random and the Cards.shuffling backends have.
+
+        :param discards: Deck; the cards dealt since the last shuffle, only used if the deck no longer holds them
+        """
+        self._gather(discards)
+        cards, n = self._cards, len(self._cards)
+        randrange = (random if self.rng is None else self.rng).randrange
+        for i in range(self._top):
+            j = randrange(i, n)
+            cards[i], cards[j] = cards[j], cards[i]
+        self._top = 0
+
+    def _next(self):
+        """
+        Take the top card off the deck.
+        """
+        top = self._top
+        card = self._cards[top]
+        self._top = top + 1
+        if self.compact:
+            card = self._decode[card]
+        if self.trackers:
+            for tracker in self.trackers:
+                tracker.seen(card)
+        return card
 
     def deal(self, *hands, cards=1, burn=False, discards=None):
         if burn:
+            card = self._next()
             if discards is not None:
-                discards.append(self[0])
-            del self[0]
+                discards.append(card)
         for i in range(cards):
             for hand in hands:
-                hand.append(self[0])
-                del self[0]
+                hand.append(self._next())
 
 
 if __name__ == "__main__":
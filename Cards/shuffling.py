@@ -0,0 +1,143 @@
+"""
+Shuffle backends for Deck.
+
+A Deck shuffles with its rng, which can be anything with a shuffle(cards) method that shuffles a list or an
+array('B') of card codes in place. random.Random (the Mersenne Twister, and the default through the random
+module) is one, and this module has some others:
+
+    NumpyShuffle        a NumPy PCG64 permutation, fastest for big and compact shoes
+    PartialShuffle      only shuffles as many cards as will be dealt before the next shuffle
+    RiffleShuffle       riffles and strip cuts like a casino dealer, for studying imperfect shuffles
+
+e.g. Shoe(decks=8, compact=True, rng=NumpyShuffle(seed=1)). NumpyShuffle needs NumPy. Continuous shuffling
+(Deck.reinsert) also needs a randrange(start, stop) method, which all of these have.
+"""
+import copy
+import math
+import random
+from array import array
+
+MersenneTwister = random.Random
+
+
+def _assign(cards, items):
+    """
+    Replace the contents of a list or array in place.
+    """
+    cards[:] = array(cards.typecode, items) if isinstance(cards, array) else items
+
+
+class Shuffler:
+    """
+    A shuffle backend, subclasses implement shuffle.
+
+    Decks copy their rng when forked, so copying a backend copies its random state too. randrange is used by
+    Deck.reinsert, it draws from self.random unless a subclass says otherwise.
+    """
+    def __copy__(self):
+        return copy.deepcopy(self)
+
+    def shuffle(self, cards):
+        raise NotImplementedError
+
+    def randrange(self, start, stop):
+        return self.random.randrange(start, stop)
+
+
+class NumpyShuffle(Shuffler):
+    """
+    Shuffle with a NumPy permutation drawn from PCG64.
+
+    Compact decks are shuffled in place in a single call, list decks are permuted by index.
+
+    :param seed: int; the seed - if None, seeded from the operating system
+    """
+    def __init__(self, seed=None):
+        import numpy as np
+
+        self.generator = np.random.Generator(np.random.PCG64(seed))
+
+    def shuffle(self, cards):
+        import numpy as np
+
+        if isinstance(cards, array):
+            self.generator.shuffle(np.frombuffer(cards, dtype=np.uint8))
+        else:
+            cards[:] = [cards[i] for i in self.generator.permutation(len(cards)).tolist()]
+
+    def randrange(self, start, stop):
+        return int(self.generator.integers(start, stop))
+
+
+class PartialShuffle(Shuffler):
+    """
+    Only shuffle the cards that will be dealt.
+
+    Runs the first depth * len(cards) steps of a Fisher-Yates shuffle, which puts a uniformly random sample of the
+    cards, in random order, on top. The cards below are left in their old order, so a deck must be shuffled again
+    before it is dealt past depth. A Table refuses a penetration that isn't below its shoe's depth, and a round
+    started before the cut card can deal a few cards beyond it, so leave room for one round between the two.
+
+    :param depth: float; the fraction of the deck that gets shuffled
+    :param seed: int; the seed - if None, seeded from the operating system
+    """
+    def __init__(self, depth: float = 0.5, seed=None):
+        self.depth = depth
+        self.random = random.Random(seed)
+
+    def shuffle(self, cards):
+        n = len(cards)
+        randrange = self.random.randrange
+        for i in range(min(n - 1, math.ceil(self.depth * n))):
+            j = randrange(i, n)
+            cards[i], cards[j] = cards[j], cards[i]
+
+
+class RiffleShuffle(Shuffler):
+    """
+    Shuffle the way a dealer does by hand.
+
+    Riffles follow the Gilbert-Shannon-Reeds model: the cut is binomial and cards drop from each half in
+    proportion to the cards left in it. A strip cut pulls packets off the top and stacks them in reverse order.
+    The default procedure is the common riffle, riffle, strip, riffle. A handful of riffles leaves a big shoe far
+    from random, which is the point.
+
+    :param procedure: str; the steps in order, 'r' for a riffle and 's' for a strip cut
+    :param packets: int; the number of packets in a strip cut
+    :param seed: int; the seed - if None, seeded from the operating system
+    """
+    def __init__(self, procedure: str = "rrsr", packets: int = 5, seed=None):
+        if set(procedure) - {'r', 's'}:
+            raise ValueError("procedure can only contain 'r' (riffle) and 's' (strip cut)")
+        self.procedure = procedure
+        self.packets = packets
+        self.random = random.Random(seed)
+
+    def riffle(self, cards):
+        n = len(cards)
+        cut = bin(self.random.getrandbits(n)).count('1') if n else 0
+        left, right = list(cards[:cut]), list(cards[cut:])
+        uniform = self.random.random
+        out = []
+        i, j = 0, 0
+        while i < cut and j < n - cut:
+            if uniform() * (n - i - j) < cut - i:
+                out.append(left[i])
+                i += 1
+            else:
+                out.append(right[j])
+                j += 1
+        _assign(cards, out + left[i:] + right[j:])
+
+    def strip(self, cards):
+        n = len(cards)
+        cuts = sorted(self.random.sample(range(1, n), min(self.packets, n) - 1)) if n > 1 else []
+        bounds = [0] + cuts + [n]
+        out = []
+        for start, end in reversed(list(zip(bounds, bounds[1:]))):
+            out += cards[start:end]
+        _assign(cards, out)
+
+    def shuffle(self, cards):
+        for step in self.procedure:
+            (self.riffle if step == 'r' else self.strip)(cards)
@@ -0,0 +1,7 @@
+"""
+Benchmarks for the Cards package.
+
+Run the whole suite with python -m benchmarks (see benchmarks/__main__.py), which writes JSON results and flags
+regressions against a stored baseline and an import time budget. Each other module can be run on its own, e.g.
+python -m benchmarks.deal
+"""
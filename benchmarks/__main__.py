@@ -0,0 +1,122 @@
+"""
+Run the benchmark suite, write the results to JSON and flag regressions against a baseline.
+
+    python -m benchmarks                        run everything, compare with benchmarks/baseline.json if it exists
+    python -m benchmarks deck_deal rounds       run some of the cases
+    python -m benchmarks --save-baseline        run everything and store the results as the new baseline
+
+A case regresses when its best rate falls more than --threshold below the baseline's, and the exit status is then
+1, as it is when import Cards takes longer than its budget (see benchmarks/startup.py). Baselines are only
+meaningful on the machine that made them, so the machine metadata of both runs is printed when it differs.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+from benchmarks import startup
+from benchmarks.suite import CASES, measure
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def machine() -> dict:
+    """
+    :return: dict; what the results depend on besides the code
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'commit': commit,
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def run(names, min_time: float = 0.2, repeat: int = 5) -> dict:
+    results = {}
+    for name in names:
+        case, unit = CASES[name]
+        results[name] = {**measure(case, min_time, repeat), 'unit': unit}
+        print(f"{name:>18} {results[name]['best']:>14,.0f} {unit}/s", file=sys.stderr)
+    return {'machine': machine(), 'results': results, 'startup': startup.check()}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    :return: list; the names of the cases that regressed
+    """
+    regressions = []
+    print(f"\n{'case':>18} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        before, after = baseline['results'][name]['best'], result['best']
+        change = after / before - 1
+        flag = ''
+        if change < -threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:>18} {before:>14,.0f} {after:>14,.0f} {change:>+8.1%}{flag}")
+
+    keys = ('python', 'implementation', 'platform', 'machine', 'processor', 'cpus')
+    if any(current['machine'].get(key) != baseline['machine'].get(key) for key in keys):
+        print("\nThe baseline was recorded on a different machine:")
+        for key in keys:
+            print(f"{key:>18} {str(baseline['machine'].get(key)):>30} {str(current['machine'].get(key)):>30}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('cases', nargs='*', help=f'the cases to run, default all of: {", ".join(CASES)}')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('-b', '--baseline', default=BASELINE, help='the baseline JSON file to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='the slowdown that counts as a regression, default 0.1')
+    parser.add_argument('--min-time', type=float, default=0.2, help='the shortest timed run in seconds')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of timed runs per case')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case{'s' * (len(unknown) > 1)} {', '.join(unknown)}")
+
+    current = run(args.cases or list(CASES), args.min_time, args.repeat)
+    over_budget = not current['startup']['ok']
+    print(f"\nimport Cards took {current['startup']['import_ms']:.1f} ms, the budget is "
+          f"{current['startup']['budget_ms']:.0f} ms" + ("  OVER BUDGET" if over_budget else ""))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        return int(over_budget)
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, store one with --save-baseline")
+        return int(over_budget)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression{'s' * (len(regressions) > 1)}: {', '.join(regressions)}")
+        return 1
+    return int(over_budget)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""
+Time dealing a whole shoe, one card at a time, for shoes of 1 to 100 decks.
+
+The cost per card should stay flat as the shoe gets deeper.
+"""
+import time
+
+from Cards.Blackjack import Hand, Shoe
+
+DECKS = (1, 2, 6, 8, 20, 50, 100)
+
+
+def deal_shoe(decks: int, compact: bool = False) -> float:
+    """
+    Deal every card in a fresh shoe.
+
+    :param decks: int; the number of decks in the shoe
+    :param compact: bool; whether to use the compact shoe storage
+    :return: float; seconds per card dealt
+    """
+    shoe = Shoe(decks=decks, compact=compact)
+    n = len(shoe)
+    hand = Hand()
+    start = time.perf_counter()
+    while len(shoe):
+        shoe.deal(hand)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    print(f"{'decks':>6} {'list ns/card':>14} {'compact ns/card':>16}")
+    for decks in DECKS:
+        print(f"{decks:>6} {deal_shoe(decks) * 1e9:>14.1f} {deal_shoe(decks, compact=True) * 1e9:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
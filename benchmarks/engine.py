@@ -0,0 +1,29 @@
+"""
+Time the headless blackjack engine in rounds per second.
+"""
+import time
+
+from Cards.Blackjack import dealer_strategy, simulate, stand_strategy
+
+ROUNDS = 100000
+
+
+def rounds_per_second(strategy, rounds: int = ROUNDS, decks: int = 6) -> float:
+    """
+    :param strategy: callable; the strategy to play
+    :param rounds: int; the number of rounds to time
+    :param decks: int; the number of decks in the shoe
+    :return: float; rounds played per second
+    """
+    start = time.perf_counter()
+    simulate(strategy, rounds, decks=decks)
+    return rounds / (time.perf_counter() - start)
+
+
+def main():
+    for strategy in (stand_strategy, dealer_strategy):
+        print(f"{strategy.__name__:>16} {rounds_per_second(strategy):>10.0f} rounds/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Time each shuffle backend in shuffles per second, for 1, 6 and 8 deck shoes in both storage formats.
+"""
+import random
+import time
+
+from Cards.Blackjack import Shoe
+from Cards.shuffling import NumpyShuffle, PartialShuffle, RiffleShuffle
+
+DECKS = (1, 6, 8)
+SECONDS = 0.2
+
+
+def backends() -> dict:
+    """
+    :return: dict; name -> a seeded shuffle backend, leaving out NumPy if it isn't installed
+    """
+    shufflers = {'mersenne twister': random.Random(0)}
+    try:
+        shufflers['numpy pcg64'] = NumpyShuffle(0)
+    except ImportError:
+        pass
+    shufflers['partial'] = PartialShuffle(seed=0)
+    shufflers['riffle/strip'] = RiffleShuffle(seed=0)
+    return shufflers
+
+
+def shuffles_per_second(rng, decks: int, compact: bool = False, seconds: float = SECONDS) -> float:
+    """
+    :param rng: the shuffle backend
+    :param decks: int; the number of decks in the shoe
+    :param compact: bool; whether to use the compact shoe storage
+    :param seconds: float; roughly how long to time for
+    :return: float; shuffles per second
+    """
+    shoe = Shoe(decks=decks, compact=compact, shuffled=False, rng=rng)
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(10):
+            shoe.shuffle()
+        n += 10
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'backend':>17} {'storage':>8}" + "".join([f"{f'{decks} decks':>12}" for decks in DECKS]))
+    for name, rng in backends().items():
+        for compact in (False, True):
+            rates = [shuffles_per_second(rng, decks, compact) for decks in DECKS]
+            print(f"{name:>17} {'compact' if compact else 'list':>8}" + "".join([f"{rate:>12.0f}" for rate in rates]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Check that import Cards stays under a fixed time budget.
+
+Each measurement imports the package in a fresh interpreter with -X importtime, so only the package's own import
+(and the standard library modules it pulls in) is counted, not interpreter startup.
+"""
+import subprocess
+import sys
+
+BUDGET_MS = 25.
+RUNS = 5
+
+
+def import_time(module: str = "Cards", runs: int = RUNS) -> float:
+    """
+    :param module: str; the module to import
+    :param runs: int; the number of fresh interpreters to try, the fastest counts
+    :return: float; the cumulative import time of the module in milliseconds
+    """
+    best = float('inf')
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, check=True).stderr
+        for line in stderr.splitlines():
+            self_us, cumulative_us, name = line.split("|")
+            if name.strip() == module:
+                best = min(best, int(cumulative_us) / 1000)
+    return best
+
+
+def check(budget_ms: float = BUDGET_MS) -> dict:
+    """
+    :return: dict; the import time of Cards and its budget in milliseconds, and whether it is within budget
+    """
+    ms = import_time()
+    return {'import_ms': ms, 'budget_ms': budget_ms, 'ok': ms <= budget_ms}
+
+
+def main():
+    result = check()
+    print(f"import Cards took {result['import_ms']:.1f} ms, the budget is {result['budget_ms']:.0f} ms")
+    return 0 if result['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
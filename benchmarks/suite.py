@@ -0,0 +1,111 @@
+"""
+The benchmark cases run by python -m benchmarks.
+
+Each case sets itself up, then times n operations and returns the seconds taken, so only the hot path is timed.
+"""
+import random
+import time
+
+import Cards
+from Cards.Blackjack import Card, Dealer, Hand, Shoe, Table, dealer_strategy, generate_options, simulate
+
+
+def card_construction(n):
+    pips, suits = list(range(2, 15)), list(range(4))
+    start = time.perf_counter()
+    for i in range(n):
+        Cards.Card(pips[i % 13], suits[i & 3])
+    return time.perf_counter() - start
+
+
+def deck_construction(n):
+    start = time.perf_counter()
+    for _ in range(n):
+        Cards.Deck(shuffled=False)
+    return time.perf_counter() - start
+
+
+def shoe_construction(n):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(n):
+        Shoe(decks=6, rng=rng)
+    return time.perf_counter() - start
+
+
+def deck_deal(n):
+    shoe = Shoe(decks=-(-n // 48), rng=random.Random(0))
+    hand = Hand()
+    start = time.perf_counter()
+    for _ in range(n):
+        shoe.deal(hand)
+    return time.perf_counter() - start
+
+
+def hand_value(n):
+    hand = Hand(Card(14, 0), Card(6, 1), Card(9, 2))
+    value = hand.value
+    start = time.perf_counter()
+    for _ in range(n):
+        value()
+    return time.perf_counter() - start
+
+
+def options(n):
+    hands = [Hand(Card(8, 0), Card(8, 1)),
+             Hand(Card(10, 0), Card(3, 1), Card(2, 2))]
+    start = time.perf_counter()
+    for i in range(n):
+        generate_options(hands[i & 1], 1, 100)
+    return time.perf_counter() - start
+
+
+def dealer_resolve(n):
+    table = Table(decks=-(-n * 4 // 48) + 1, rng=random.Random(0))
+    starts = [Hand(*table.shoe[i:i + 2]) for i in range(0, 48, 2)]
+    dealers = [Dealer() for _ in range(n)]
+    for i, dealer in enumerate(dealers):
+        dealer.hand = Hand(*starts[i % len(starts)])
+    start = time.perf_counter()
+    for dealer in dealers:
+        dealer.resolve(table)
+    return time.perf_counter() - start
+
+
+def rounds(n):
+    table = Table(rng=random.Random(0))
+    start = time.perf_counter()
+    simulate(dealer_strategy, n, table=table)
+    return time.perf_counter() - start
+
+
+# name -> (case, unit)
+CASES = {
+    'card_construction': (card_construction, 'cards'),
+    'deck_construction': (deck_construction, 'decks'),
+    'shoe_construction': (shoe_construction, 'shoes'),
+    'deck_deal': (deck_deal, 'cards'),
+    'hand_value': (hand_value, 'calls'),
+    'generate_options': (options, 'calls'),
+    'dealer_resolve': (dealer_resolve, 'hands'),
+    'rounds': (rounds, 'rounds'),
+}
+
+
+def measure(case, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """
+    Time a case, growing n until a run takes at least min_time, then repeating.
+
+    :param case: callable; case(n) returns the seconds taken by n operations
+    :param min_time: float; the shortest run to time
+    :param repeat: int; the number of timed runs
+    :return: dict; n and the best and median operations per second over the runs
+    """
+    n = 1
+    while True:
+        seconds = case(n)
+        if seconds >= min_time:
+            break
+        n *= 2 if seconds <= 0 else min(10, max(2, int(min_time / seconds * 1.2)))
+    rates = sorted([n / case(n) for _ in range(repeat)])
+    return {'n': n, 'best': rates[-1], 'median': rates[len(rates) // 2]}
@@ -0,0 +1,3 @@
+"""
+Lets pytest import Cards from the checkout without installing it.
+"""
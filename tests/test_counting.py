@@ -0,0 +1,83 @@
+"""
+Trackers only count the cards a player at the table could have seen.
+"""
+import random
+from collections import Counter
+
+from Cards.Blackjack import Composition, HiLo, Table, composition, dealer_strategy
+from Cards.Blackjack.multiseat import MultiTable, Seat
+
+
+def counted(table):
+    """
+    The composition a tracker should have: the shoe plus the cards still face down.
+    """
+    return composition(table.shoe[:] + table.face_down)
+
+
+def test_face_down_cards_wait_to_be_turned_over():
+    table = Table(rng=random.Random(0), chips=10 ** 6)
+    counts, count = table.track(Composition()), table.track(HiLo())
+    for _ in range(500):
+        table.chips -= 1
+        table.bet = 1
+        table.initial_deal()
+        burn, hole = table.discards[-1], table.dealer.hand[1]
+        assert Counter(table.face_down) == Counter([burn, hole])
+        assert tuple(counts.counts) == counted(table)
+        assert count.remaining == len(table.shoe) + 2
+
+        def strategy(hand, options):
+            assert tuple(counts.counts) == counted(table)
+            return dealer_strategy(hand, table.dealer.hand[0], options)
+
+        hands = table.decide(strategy)
+        table.dealer.resolve(table)
+        assert table.face_down == [burn]
+        assert tuple(counts.counts) == counted(table)
+        table.settle(hands)
+        table.end_hand()
+        assert not table.face_down
+        if table.discards:
+            assert tuple(counts.counts) == composition(table.shoe)
+
+
+def test_play_round_ends_with_everything_counted():
+    table = Table(rng=random.Random(1), chips=10 ** 6)
+    counts = table.track(Composition())
+    for _ in range(500):
+        table.play_round(dealer_strategy)
+        assert not table.face_down and tuple(counts.counts) == composition(table.shoe)
+
+
+def test_multitable():
+    table = MultiTable([Seat(dealer_strategy, chips=10 ** 6) for _ in range(4)], rng=random.Random(2))
+    counts = table.track(Composition())
+    for _ in range(300):
+        table.play_round()
+        assert tuple(counts.counts) == composition(table.shoe)
+
+
+def test_snapshot_keeps_face_down_cards():
+    table = Table(rng=random.Random(3))
+    table.track(Composition())
+    table.initial_deal()
+    state = table.snapshot()
+    face_down = list(table.face_down)
+    table.dealer.resolve(table)
+    table.restore(state)
+    assert table.face_down == face_down
+    tracker = table.shoe.trackers[0]
+    assert tuple(tracker.counts) == counted(table)
+    before = tuple(tracker.counts)
+    fork = table.fork(random.Random(4))
+    fork.dealer.resolve(fork)
+    assert table.face_down == face_down and tuple(tracker.counts) == before
+    assert tuple(fork.shoe.trackers[0].counts) == counted(fork)
+
+
+def test_untracked_tables_keep_nothing_face_down():
+    table = Table(rng=random.Random(5))
+    table.play_round(dealer_strategy)
+    table.initial_deal()
+    assert table.face_down == []
@@ -0,0 +1,83 @@
+"""
+The fast poker evaluator against a brute force ranker that scores every five card subset.
+"""
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from Cards.Poker.evaluator import CATEGORIES, category, evaluate, evaluate_batch
+
+CODES = range(8, 60)
+
+
+def rank_five(cards):
+    """
+    (category, tie breaking pips) for five card codes, in the order of CATEGORIES.
+    """
+    pips = sorted([code // 4 for code in cards], reverse=True)
+    counts = Counter(pips)
+    ranks = [pip for pip, n in sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)]
+    shape = sorted(counts.values(), reverse=True)
+    flush = len({code % 4 for code in cards}) == 1
+    straight = None
+    if len(counts) == 5:
+        if pips[0] - pips[4] == 4:
+            straight = pips[0]
+        elif pips == [14, 5, 4, 3, 2]:
+            straight = 5
+    if straight and flush:
+        return 8, straight
+    if shape == [4, 1]:
+        return (7, *ranks)
+    if shape == [3, 2]:
+        return (6, *ranks)
+    if flush:
+        return (5, *pips)
+    if straight:
+        return 4, straight
+    return ({(3, 1, 1): 3, (2, 2, 1): 2, (2, 1, 1, 1): 1, (1, 1, 1, 1, 1): 0}[tuple(shape)], *ranks)
+
+
+def rank(cards):
+    return max([rank_five(five) for five in combinations(cards, 5)])
+
+
+def hands(n, size, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(CODES, size) for _ in range(n)]
+
+
+def code(text):
+    return 'xx23456789TJQKA'.index(text[0]) * 4 + 'shdc'.index(text[1])
+
+
+EDGE_CASES = [[code(card) for card in hand.split()] for hand in (
+    "As 2h 3d 4c 5s",           # the wheel is five high
+    "As 2s 3s 4s 5s Ks Qs",     # a steel wheel, not the king high flush
+    "Ts Js Qs Ks As 9s 8s",     # royal flush
+    "9h 9s 9d 5c 5s 5d 2c",     # two trips make a full house
+    "Kh Ks 7d 7c 3s 3d Ac",     # three pairs, the ace plays
+    "Qh Qs Qd Qc 8s 8d 8c",     # quads with trips
+    "2h 4h 6h 8h Th Qh Ah",     # seven suited
+    "5s 6h 7d 8c 9s Th Jd",     # seven card straight
+)]
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_order_matches_brute_force(size):
+    sample = hands(4000, size, seed=size) + [hand[:size] for hand in EDGE_CASES if len(hand) >= size]
+    ranked = sorted([(rank(hand), evaluate(hand), hand) for hand in sample])
+    for (rank_a, score_a, hand_a), (rank_b, score_b, hand_b) in zip(ranked, ranked[1:]):
+        assert (score_a < score_b) if rank_a < rank_b else (score_a == score_b), (hand_a, hand_b)
+    for reference, score, hand in ranked:
+        assert category(score) == CATEGORIES[reference[0]], hand
+
+
+def test_batch_matches_single():
+    np = pytest.importorskip("numpy")
+    for size in (5, 6, 7):
+        sample = hands(2000, size, seed=10 + size) + [hand[:size] for hand in EDGE_CASES if len(hand) >= size]
+        scores = evaluate_batch(np.array(sample, dtype=np.uint8))
+        assert scores.tolist() == [evaluate(hand) for hand in sample]
@@ -0,0 +1,65 @@
+"""
+Hand indexes by suit and pip, and the views they give.
+"""
+import pytest
+
+from Cards import Card, Hand, HandView
+from Cards.Blackjack import Hand as BlackjackHand
+
+
+def make(text):
+    return Hand.from_string(text)
+
+
+def test_masks_and_counts():
+    hand = make("As 8h 8s Kd 2s")
+    assert hand.suit_mask('s') == 0b10101
+    assert hand.pip_mask(8) == 0b00110
+    assert hand.suit_count('spades') == 3 and hand.suit_count('c') == 0
+    assert hand.pip_count('a') == 1 and hand.pip_count(8) == 2
+
+
+def test_views():
+    hand = make("As 8h 8s Kd 2s")
+    spades = hand.suit('s')
+    assert isinstance(spades, HandView)
+    assert spades.cards == make("As 8s 2s").cards
+    assert hand.pip(8).cards == make("8h 8s").cards
+    assert hand.pip(3).cards == [] and not hand.pip(3)
+    assert [card.pip for card in hand.sorted()] == [14, 13, 8, 8, 2]
+    assert [card.pip for card in hand.sorted(reverse=False)] == [2, 8, 8, 13, 14]
+    assert spades[1:].cards == make("8s 2s").cards
+    assert isinstance(spades.hand(), Hand) and spades.to_string() == "AS 8S 2S"
+
+
+def test_sorted_does_not_change_the_hand():
+    hand = make("2s Kd As")
+    hand.sorted()
+    assert hand.to_string() == "2S KD AS"
+
+
+def test_slices_are_hands():
+    hand = make("As 8h 8s")
+    assert isinstance(hand[1:], Hand) and hand[1:].cards == make("8h 8s").cards
+    blackjack = BlackjackHand.from_string("As 8h 2s")
+    assert isinstance(blackjack[:2], BlackjackHand) and blackjack[:2].value() == 19
+
+
+def test_views_are_read_only():
+    hand = make("As 8h")
+    with pytest.raises(TypeError):
+        hand.suit('s').append(Card(9, 0))
+    with pytest.raises(TypeError):
+        hand.sorted().restore(())
+    assert len(hand) == 2
+
+
+def test_index_follows_changes():
+    hand = make("8s 8h")
+    assert hand.pip_count(8) == 2
+    hand.append(Card(8, 2))
+    assert hand.pip_count(8) == 3 and hand.suit('d').cards == [Card(8, 2)]
+    hand.restore(make("8s 9h").snapshot())
+    assert hand.pip_count(8) == 1 and hand.pip(8).cards == [Card(8, 0)]
+    hand.cards = make("Ks Kh").cards
+    assert hand.pip_count(8) == 0 and hand.pip_count('k') == 2
@@ -0,0 +1,110 @@
+"""
+The binary hand history: writing, reading back, resuming and refusing logs it can't read.
+"""
+import random
+
+import pytest
+
+from Cards.Blackjack import Hand, Table, dealer_strategy, simulate
+from Cards.Blackjack.history import HEADER, RECORD, HistoryRecorder, read_array, read_history
+from Cards.Blackjack.multiseat import MultiTable, Seat
+
+
+def record_rounds(path, rounds, seed=0):
+    table = Table(rng=random.Random(seed), chips=10 ** 6)
+    with HistoryRecorder(path) as recorder:
+        table.recorder = recorder
+        simulate(dealer_strategy, rounds, table=table)
+    return table
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "hands.bjh"
+    record_rounds(path, 200)
+    records = list(read_history(path))
+    assert len(records) >= 200
+    assert [record.round for record in records] == sorted(record.round for record in records)
+    assert records[-1].round == 199
+    for record in records:
+        assert isinstance(record.player, Hand) and len(record.player) >= 2
+        assert record.outcome in ('blackjack', 'bust', 'dealer bust', 'win', 'lose')
+        assert set(record.actions) <= {'stand', 'hit', 'double', 'split'}
+        assert record.seat == 0
+    raw = list(read_history(path, decode=False))
+    assert [record.round for record in raw] == [record.round for record in records]
+    assert raw[0].player[:2] == bytes([card.code for card in records[0].player[:2]])
+
+
+def test_array_matches_records(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "hands.bjh"
+    record_rounds(path, 100)
+    records = list(read_history(path, decode=False))
+    array = read_array(path)
+    assert len(array) == len(records)
+    for field in ('round', 'position', 'seat', 'hand', 'outcome', 'bet', 'payout'):
+        assert array[field].tolist() == [getattr(record, field) for record in records]
+    assert bytes(array['player'][5]) == records[5].player
+
+
+def test_reopening_carries_on_the_rounds(tmp_path):
+    path = tmp_path / "hands.bjh"
+    record_rounds(path, 3)
+    record_rounds(path, 3, seed=1)
+    assert sorted({record.round for record in read_history(path)}) == list(range(6))
+
+
+def test_a_cut_off_record_is_dropped(tmp_path):
+    path = tmp_path / "hands.bjh"
+    record_rounds(path, 5)
+    whole = list(read_history(path, decode=False))
+    with open(path, 'ab') as f:
+        f.write(RECORD.pack(*whole[-1])[:RECORD.size // 2])
+    assert list(read_history(path, decode=False)) == whole
+    with HistoryRecorder(path) as recorder:
+        assert recorder.rounds == whole[-1].round + 1
+    assert path.stat().st_size == HEADER.size + len(whole) * RECORD.size
+    record_rounds(path, 2)
+    assert len(list(read_history(path))) > len(whole)
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "hands.bjh"
+    path.write_bytes(HEADER.pack(b'BJHH', 1, 52) + bytes(52))
+    with pytest.raises(ValueError):
+        HistoryRecorder(path)
+    with pytest.raises(ValueError):
+        list(read_history(path))
+    path.write_bytes(b"not a history at all")
+    with pytest.raises(ValueError):
+        HistoryRecorder(path)
+
+
+def test_an_empty_log(tmp_path):
+    path = tmp_path / "hands.bjh"
+    HistoryRecorder(path).close()
+    assert list(read_history(path)) == []
+
+
+def test_seats_and_split_hands(tmp_path):
+    path = tmp_path / "hands.bjh"
+    # Splitting every pair makes sure some seats play more than one hand
+    def split(hand, upcard, options):
+        return 'split' if 'split' in options else dealer_strategy(hand, upcard, options)
+
+    table = MultiTable([Seat(dealer_strategy, chips=10 ** 6), Seat(split, chips=10 ** 6),
+                        Seat(split, chips=10 ** 6)], rng=random.Random(2))
+    played = 0
+    with HistoryRecorder(path) as recorder:
+        table.recorder = recorder
+        for _ in range(300):
+            played += table.play_round()
+    records = list(read_history(path))
+    assert len(records) == played == sum(seat.hands_played for seat in table.seats)
+    for i, seat in enumerate(table.seats):
+        assert sum(record.seat == i for record in records) == seat.hands_played
+    assert any(record.hand > 0 for record in records)
+    assert all(record.hand == 0 for record in records if record.seat == 0)
+    for a, b in zip(records, records[1:]):
+        if a.round == b.round and a.seat == b.seat:
+            assert b.hand == a.hand + 1
@@ -0,0 +1,49 @@
+"""
+The blackjack server's line protocol, including input it should turn away.
+"""
+import asyncio
+
+from Cards.Blackjack.server import BlackjackServer, load_test
+
+
+async def converse(lines):
+    """
+    Send each line to a fresh server and collect the first line of each reply.
+    """
+    server = BlackjackServer()
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = [await reader.readline()]
+        for line in lines:
+            writer.write(line)
+            replies.append(await reader.readline())
+        writer.close()
+    return [reply.decode().strip() for reply in replies]
+
+
+def test_bad_input_gets_an_error():
+    replies = asyncio.run(converse([
+        "BET ²\n".encode(),
+        "BET ٣\n".encode(),
+        b"BET 0\n",
+        b"BET 1000\n",
+        b"\xff\xfe\n",
+        b"x" * 100000 + b"\n",
+        b"QUIT\n",
+    ]))
+    assert replies == ["WELCOME 100", "ERROR expected BET <chips>", "ERROR expected BET <chips>",
+                       "ERROR expected BET <chips>", "ERROR You do not have enough chips.",
+                       "ERROR expected UTF-8 text", "ERROR line too long", "BYE"]
+
+
+def test_a_round():
+    replies = asyncio.run(converse([b"bet 5\n"]))
+    assert replies[0] == "WELCOME 100"
+    assert replies[1].split()[0] in ("HAND", "DEALER")
+
+
+def test_load_test():
+    result = asyncio.run(load_test(sessions=20, rounds=3))
+    assert result['actions'] > 0 and result['p50'] <= result['p99']
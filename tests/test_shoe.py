@@ -0,0 +1,93 @@
+"""
+Reshuffling at the cut card and continuous shuffling keep every card, in the shoe's one buffer.
+"""
+import random
+from collections import Counter
+
+import pytest
+
+from Cards.Blackjack import Composition, HiLo, Table, composition, dealer_strategy, simulate
+from Cards.Blackjack.metrics import TableMetrics
+from Cards.Blackjack.multiseat import MultiTable, Seat
+from Cards.shuffling import NumpyShuffle, PartialShuffle, RiffleShuffle
+
+
+def backends():
+    yield random.Random(0)
+    yield PartialShuffle(seed=0)
+    yield RiffleShuffle(seed=0)
+    try:
+        yield NumpyShuffle(0)
+    except ImportError:
+        pass
+
+
+def all_cards(table):
+    """
+    Every card at the table, wherever it is.
+    """
+    held = table.player.cards + table.dealer.hand.cards + [card for hand, bet in table.hands for card in hand]
+    return Counter(table.shoe[:] + table.discards[:] + held)
+
+
+@pytest.mark.parametrize("csm", [False, True])
+@pytest.mark.parametrize("rng", list(backends()), ids=lambda rng: type(rng).__name__)
+def test_cards_are_conserved(rng, csm):
+    table = Table(rng=rng, csm=csm, chips=10 ** 6)
+    table.metrics = TableMetrics()
+    buffer, cards = table.shoe._cards, all_cards(table)
+    simulate(dealer_strategy, 3000, table=table)
+    assert all_cards(table) == cards
+    assert table.shoe._cards is buffer
+    if csm:
+        assert len(table.shoe) == 288 and table.metrics.reshuffles == table.metrics.rounds
+    else:
+        assert table.metrics.reshuffles > 0
+
+
+def test_reshuffles_at_the_cut():
+    table = Table(rng=random.Random(1), penetration=0.5, chips=10 ** 6)
+    assert table.cut == 144
+    reshuffles = 0
+    for _ in range(2000):
+        table.play_round(dealer_strategy)
+        assert len(table.discards) <= table.cut
+        if not table.discards:
+            assert len(table.shoe) == 288
+            reshuffles += 1
+    assert reshuffles
+
+
+def test_reshuffle_after_cards_are_read():
+    # With the dealt cards gone from the buffer, the discards are put back instead
+    table = Table(rng=random.Random(2), chips=10 ** 6)
+    cards = all_cards(table)
+    for _ in range(100):
+        table.play_round(dealer_strategy)
+        table.shoe._drop_dealt()
+    assert all_cards(table) == cards
+
+
+def test_csm_trackers():
+    table = Table(rng=random.Random(3), csm=True, chips=10 ** 6)
+    counts, count = table.track(Composition()), table.track(HiLo())
+    for _ in range(200):
+        table.play_round(dealer_strategy)
+        assert tuple(counts.counts) == composition(table.shoe)
+        assert count.running == 0 and count.remaining == 288
+
+
+def test_multitable_conserves_cards():
+    table = MultiTable([Seat(dealer_strategy, chips=10 ** 6) for _ in range(5)], rng=random.Random(4), csm=True)
+    cards = Counter(table.shoe[:])
+    for _ in range(300):
+        table.play_round()
+    assert Counter(table.shoe[:]) == cards
+
+
+@pytest.mark.parametrize("penetration", [0, 1, 1.5])
+def test_penetration_is_checked(penetration):
+    with pytest.raises(ValueError):
+        Table(penetration=penetration)
+    with pytest.raises(ValueError):
+        Table(rng=PartialShuffle(depth=0.25), penetration=0.3)
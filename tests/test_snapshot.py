@@ -0,0 +1,88 @@
+"""
+Snapshots, restores and forks give back exactly the same game.
+"""
+import random
+
+import pytest
+
+from Cards.Blackjack import Hand, HiLo, Shoe, Table, dealer_strategy
+
+
+def play(table, rounds):
+    """
+    The winnings, cards and chips of each round played.
+    """
+    results = []
+    for _ in range(rounds):
+        won = table.play_round(dealer_strategy)
+        results.append((won, table.shoe.to_bytes()[:8], table.chips))
+    return results
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_deck_restore(compact):
+    shoe = Shoe(decks=2, compact=compact, rng=random.Random(0))
+    del shoe[0]
+    snapshot, before = shoe.snapshot(), shoe.to_bytes()
+    hand = Hand()
+    shoe.deal(hand, cards=5)
+    shoe.shuffle()
+    shoe.append(hand[0])
+    shoe.restore(snapshot)
+    assert shoe.to_bytes() == before
+    shoe.deal(hand)
+    shoe.restore(snapshot)
+    assert shoe.to_bytes() == before
+
+
+def test_table_replays_from_snapshot():
+    rng = random.Random(1)
+    table = Table(rng=rng, chips=10 ** 6)
+    play(table, 50)
+    state, rng_state = table.snapshot(), rng.getstate()
+    # Long enough to reshuffle a few times, which draws on the rng
+    first = play(table, 300)
+    table.restore(state)
+    rng.setstate(rng_state)
+    assert play(table, 300) == first
+
+
+def test_every_choice_from_a_decision():
+    table = Table(rng=random.Random(2))
+    table.chips -= 1
+    table.bet = 1
+    table.initial_deal()
+    state = table.snapshot()
+    player, shoe = table.player.cards[:], table.shoe.to_bytes()
+    outcomes = {}
+    for choice in ('stand', 'hit', 'hit'):
+        table.restore(state)
+        assert table.player.cards == player and table.shoe.to_bytes() == shoe
+        hands = table.decide(lambda hand, options: choice if choice in options else 'stand')
+        table.dealer.resolve(table)
+        outcome = (table.settle(hands), [hand.cards for hand, bet in hands], table.dealer.hand.cards)
+        # Trying the same choice again from the same point plays out the same way
+        assert outcomes.setdefault(choice, outcome) == outcome
+
+
+def test_fork_is_independent():
+    table = Table(rng=random.Random(3), chips=10 ** 6)
+    counter = table.track(HiLo())
+    play(table, 20)
+    remaining, running = table.shoe.to_bytes(), counter.running
+    fork = table.fork(random.Random(4))
+    play(fork, 500)
+    assert table.shoe.to_bytes() == remaining
+    assert counter.running == running and fork.shoe.trackers[0] is not counter
+
+    twin, other = table.fork(random.Random(5)), table.fork(random.Random(5))
+    assert play(twin, 300) == play(other, 300)
+
+
+def test_hand_restore_recounts():
+    hand = Hand.from_string("As 6d")
+    snapshot = hand.snapshot()
+    hand.append(Hand.from_string("9c")[0])
+    assert hand.value() == 16
+    hand.restore(snapshot)
+    assert hand.value() == 17 and hand.soft()
@@ -0,0 +1,81 @@
+"""
+Card text and byte round trips.
+"""
+import random
+from array import array
+
+import pytest
+
+from Cards import Card, Deck, Hand, format_codes, parse_codes, parse_codes_batch
+from Cards.Blackjack import Shoe
+
+CODES = list(range(8, 60))
+
+
+def test_every_card_round_trips():
+    text = format_codes(CODES)
+    assert parse_codes(text).tolist() == CODES
+    assert parse_codes(text.lower()).tolist() == CODES
+    assert parse_codes(text.replace(" ", "")).tolist() == CODES
+    assert [Card.from_code(code) for code in parse_codes(text)] == [Card(code // 4, code % 4) for code in CODES]
+
+
+@pytest.mark.parametrize("text, codes", [
+    ("As Kd", [56, 54]),
+    ("AsKd", [56, 54]),
+    ("TH, 10h|10♡", [41, 41, 41]),
+    ("2♣;3♧\n4c", [11, 15, 19]),
+    ("", []),
+])
+def test_parse_formats(text, codes):
+    assert parse_codes(text).tolist() == codes
+
+
+def test_strict():
+    with pytest.raises(ValueError):
+        parse_codes("As Kx")
+    with pytest.raises(ValueError):
+        parse_codes("As 1s")
+    assert parse_codes("As Kx 9d", strict=False).tolist() == [56, 38]
+
+
+def test_batch_matches_single():
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    styles = [lambda code: format_codes([code]), lambda code: format_codes([code]).lower(),
+              lambda code: format_codes([code]).replace("T", "10"),
+              lambda code: format_codes([code])[0] + "♠♡♢♣"[code % 4]]
+    lines = [[rng.choice(CODES) for _ in range(rng.randrange(8))] for _ in range(500)]
+    text = "\n".join([rng.choice([" ", ",", ""]).join([rng.choice(styles)(code) for code in line])
+                      for line in lines])
+    expected = [code for line in lines for code in line]
+    assert parse_codes(text).tolist() == expected
+
+    for data in (text, text.encode()):
+        codes, numbers = parse_codes_batch(data, lines=True)
+        assert codes.tolist() == expected
+        assert numbers.tolist() == [i for i, line in enumerate(lines) for _ in line]
+        assert parse_codes_batch(data).tolist() == expected
+
+
+def test_hand_round_trips():
+    hand = Hand(*[Card.from_code(code) for code in random.Random(1).sample(CODES, 7)])
+    assert Hand.from_string(hand.to_string()).cards == hand.cards
+    assert Hand.from_bytes(hand.to_bytes()).cards == hand.cards
+    with pytest.raises(ValueError):
+        Hand.from_bytes(b"\x07")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_deck_round_trips(compact):
+    deck = Shoe(decks=2, compact=compact, rng=random.Random(2))
+    del deck[0]
+    data = deck.to_bytes()
+    assert len(data) == len(deck)
+    for copy in (Shoe.from_bytes(data, compact=compact), Shoe.from_string(deck.to_string(), compact=compact)):
+        assert type(copy) is Shoe
+        assert copy.to_bytes() == data
+        assert copy[:] == deck[:]
+    assert Deck.from_bytes(data, compact=True)._cards == array('B', data)
+    with pytest.raises(ValueError):
+        Deck.from_bytes(b"\x3c")